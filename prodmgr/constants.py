@@ -39,4 +39,10 @@ DEFAULT_CERT_TARGET_DIR = '/var/lib/ca-certificates'
 #    sure how, though.
 DEFAULT_PRODUCT_CATALOG_NAME = 'cray-product-catalog'
 DEFAULT_PRODUCT_CATALOG_NAMESPACE = 'services'
-DEFAULT_LOG_DIR = '/etc/cray/upgrade/csm/iuf/deletion'
+# The log directory may be moved with $PRODMGR_LOG_DIR, e.g. for test runs on a development machine.
+DEFAULT_LOG_DIR = os.environ.get('PRODMGR_LOG_DIR', '/etc/cray/upgrade/csm/iuf/deletion')
+DEFAULT_HISTORY_INDEX_FILE = os.path.join(DEFAULT_LOG_DIR, 'history.db')
+DEFAULT_JOURNAL_FILE = os.path.join(DEFAULT_LOG_DIR, 'journal.jsonl')
+DEFAULT_PRUNE_WORKERS = 4
+# Seconds for a container to exit after SIGTERM before it is killed, as for podman stop.
+DEFAULT_KILL_GRACE = 10
@@ -0,0 +1,175 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Structural comparison of product catalogs.
+"""
+
+from collections import namedtuple
+import json
+
+from yaml import safe_load, YAMLError
+
+from prodmgr.errors import ProdmgrError
+
+# A single difference between two catalogs. The change is one of '+' (added),
+# '-' (removed) or '~' (changed). For a whole product version, section and
+# entry are None.
+CatalogChange = namedtuple('CatalogChange', ['change', 'product', 'version', 'section', 'entry'])
+
+
+def _load_product(raw_versions, product, source):
+    """Parse the YAML string describing the versions of a product.
+
+    Args:
+        raw_versions (str): The YAML string, or None if the product is absent.
+        product (str): The name of the product.
+        source (str): A description of the catalog the product came from.
+
+    Returns:
+        dict: The versions of the product.
+    """
+    if raw_versions is None:
+        return {}
+    try:
+        return safe_load(raw_versions) or {}
+    except YAMLError as err:
+        raise ProdmgrError(f'The entry for {product} in {source} contained invalid YAML: {err}')
+
+
+def _entry_key(entry):
+    """Get a hashable key that is equal for identical entries."""
+    return json.dumps(entry, sort_keys=True, default=str)
+
+
+def _entry_label(entry):
+    """Get a short human-readable description of an entry in a component list."""
+    if isinstance(entry, dict) and 'name' in entry:
+        if entry.get('version') is not None:
+            return f'{entry["name"]}:{entry["version"]}'
+        return str(entry['name'])
+    return str(entry)
+
+
+def _diff_lists(old_list, new_list):
+    """Yield the (change, entry) pairs between two lists, ignoring order."""
+    old_keys = {_entry_key(entry) for entry in old_list}
+    new_keys = {_entry_key(entry) for entry in new_list}
+    for entry in old_list:
+        if _entry_key(entry) not in new_keys:
+            yield '-', _entry_label(entry)
+    for entry in new_list:
+        if _entry_key(entry) not in old_keys:
+            yield '+', _entry_label(entry)
+
+
+def _diff_version(product, version, old_data, new_data):
+    """Yield the changes between the data for two instances of a product version."""
+    old_data = old_data if isinstance(old_data, dict) else {}
+    new_data = new_data if isinstance(new_data, dict) else {}
+
+    for section in sorted(set(old_data) | set(new_data), key=str):
+        old_value = old_data.get(section)
+        new_value = new_data.get(section)
+        if old_value == new_value:
+            continue
+
+        if section == 'component_versions' and isinstance(old_value or {}, dict) \
+                and isinstance(new_value or {}, dict):
+            old_value, new_value = old_value or {}, new_value or {}
+            for kind in sorted(set(old_value) | set(new_value), key=str):
+                for change, entry in _diff_lists(old_value.get(kind) or [], new_value.get(kind) or []):
+                    yield CatalogChange(change, product, version, kind, entry)
+        elif isinstance(old_value or {}, dict) and isinstance(new_value or {}, dict):
+            old_value, new_value = old_value or {}, new_value or {}
+            for key in sorted(set(old_value) | set(new_value), key=str):
+                if key not in new_value:
+                    yield CatalogChange('-', product, version, section, str(key))
+                elif key not in old_value:
+                    yield CatalogChange('+', product, version, section, str(key))
+                elif old_value[key] != new_value[key]:
+                    yield CatalogChange('~', product, version, section, str(key))
+        elif isinstance(old_value or [], list) and isinstance(new_value or [], list):
+            for change, entry in _diff_lists(old_value or [], new_value or []):
+                yield CatalogChange(change, product, version, section, entry)
+        else:
+            yield CatalogChange('~', product, version, section, f'{old_value} -> {new_value}')
+
+
+def diff_catalogs(old_catalog_data, new_catalog_data, old_source='old catalog', new_source='new catalog'):
+    """Compare two product catalogs.
+
+    Products whose YAML strings are identical in both catalogs are skipped
+    without being parsed, so the cost of a comparison depends on how much of
+    the catalog changed rather than on its size.
+
+    Args:
+        old_catalog_data (dict): Product names to unparsed YAML strings, as
+            returned by read_catalog_data, for the older catalog.
+        new_catalog_data (dict): The same, for the newer catalog.
+        old_source (str): A description of the older catalog for messages.
+        new_source (str): A description of the newer catalog for messages.
+
+    Returns:
+        list of CatalogChange: The added, removed and changed product versions
+            and entries, sorted by product and version.
+
+    Raises:
+        ProdmgrError: if a changed product entry contains invalid YAML.
+    """
+    changes = []
+    for product in sorted(set(old_catalog_data) | set(new_catalog_data)):
+        old_raw = old_catalog_data.get(product)
+        new_raw = new_catalog_data.get(product)
+        if old_raw == new_raw:
+            continue
+
+        old_versions = _load_product(old_raw, product, old_source)
+        new_versions = _load_product(new_raw, product, new_source)
+        for version in sorted(set(old_versions) | set(new_versions), key=str):
+            if version not in new_versions:
+                changes.append(CatalogChange('-', product, str(version), None, None))
+            elif version not in old_versions:
+                changes.append(CatalogChange('+', product, str(version), None, None))
+            elif old_versions[version] != new_versions[version]:
+                changes.extend(_diff_version(product, str(version),
+                                             old_versions[version], new_versions[version]))
+    return changes
+
+
+def format_changes(changes):
+    """Format catalog changes, one per line.
+
+    Args:
+        changes (list of CatalogChange): The changes to format.
+
+    Returns:
+        str: The formatted changes.
+    """
+    lines = []
+    for change in changes:
+        fields = [change.change, change.product, change.version]
+        if change.section is not None:
+            fields.extend([change.section, change.entry])
+        lines.append(' '.join(fields))
+    return '\n'.join(lines)
@@ -0,0 +1,162 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Index of prodmgr runs, kept in an SQLite database next to the log files.
+"""
+
+import sqlite3
+
+HISTORY_COLUMNS = ('started', 'action', 'product', 'version', 'image', 'duration', 'exit_status', 'log_file')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    action TEXT NOT NULL,
+    product TEXT NOT NULL,
+    version TEXT NOT NULL,
+    image TEXT,
+    duration REAL NOT NULL,
+    exit_status INTEGER NOT NULL,
+    log_file TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_product ON runs (product, started);
+CREATE INDEX IF NOT EXISTS runs_exit_status ON runs (exit_status, started);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+'''
+
+
+def _connect(index_file):
+    """Open the history index, creating its table if needed.
+
+    Args:
+        index_file (str): The path of the SQLite database.
+
+    Returns:
+        sqlite3.Connection: The connection.
+    """
+    # Several prodmgr runs may finish at once, so wait for the write lock.
+    connection = sqlite3.connect(index_file, timeout=30)
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def record_run(index_file, started, action, product, version, image, duration, exit_status, log_file):
+    """Add a prodmgr run to the history index.
+
+    Args:
+        index_file (str): The path of the SQLite database.
+        started (datetime): When the run started.
+        action (str): The action of the run.
+        product (str): The product operated on.
+        version (str): The version operated on.
+        image (str): The utility image run, or None if none was run.
+        duration (float): The time taken by the run in seconds.
+        exit_status (int): The exit status of the run.
+        log_file (str): The log file of the run.
+
+    Raises:
+        sqlite3.Error: if the index could not be updated.
+    """
+    connection = _connect(index_file)
+    try:
+        with connection:
+            connection.execute(
+                'INSERT INTO runs (started, action, product, version, image, duration, exit_status, log_file) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (started.strftime('%Y-%m-%d %H:%M:%S'), action, product, version, image,
+                 duration, exit_status, log_file)
+            )
+    finally:
+        connection.close()
+
+
+def query_runs(index_file, action=None, product=None, version=None, failed=None, since=None, limit=None):
+    """Find runs in the history index, most recent first.
+
+    Args:
+        index_file (str): The path of the SQLite database.
+        action (str): Only include runs of this action.
+        product (str): Only include runs on this product.
+        version (str): Only include runs on this version.
+        failed (bool): If True, only include failed runs; if False, only
+            include successful runs; if None, include both.
+        since (str): Only include runs started at or after this time, in the
+            form YYYY-MM-DD or YYYY-MM-DD HH:MM:SS.
+        limit (int): The maximum number of runs to return.
+
+    Returns:
+        list of dict: The runs, with keys from HISTORY_COLUMNS.
+
+    Raises:
+        sqlite3.Error: if the index could not be read.
+    """
+    conditions = []
+    parameters = []
+    for column, value in (('action', action), ('product', product), ('version', version)):
+        if value is not None:
+            conditions.append(f'{column} = ?')
+            parameters.append(value)
+    if failed is not None:
+        conditions.append('exit_status != 0' if failed else 'exit_status = 0')
+    if since is not None:
+        conditions.append('started >= ?')
+        parameters.append(since)
+
+    query = f'SELECT {", ".join(HISTORY_COLUMNS)} FROM runs'
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += ' ORDER BY started DESC, id DESC'
+    if limit:
+        query += ' LIMIT ?'
+        parameters.append(limit)
+
+    # The schema is not created here, so that a read-only index can be queried.
+    connection = sqlite3.connect(index_file, timeout=30)
+    try:
+        return [dict(zip(HISTORY_COLUMNS, row)) for row in connection.execute(query, parameters)]
+    finally:
+        connection.close()
+
+
+def format_runs(runs):
+    """Format runs from the history index as a table.
+
+    Args:
+        runs (list of dict): The runs, as returned by query_runs.
+
+    Returns:
+        str: A table with one row per run.
+    """
+    rows = [('STARTED', 'ACTION', 'PRODUCT', 'VERSION', 'STATUS', 'DURATION', 'IMAGE', 'LOG FILE')]
+    for run in runs:
+        rows.append((run['started'], run['action'], run['product'], run['version'],
+                     'ok' if run['exit_status'] == 0 else f'failed ({run["exit_status"]})',
+                     f'{run["duration"]:.1f}s', run['image'] or '-', run['log_file'] or '-'))
+
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]) - 1)]
+    return '\n'.join(
+        '  '.join(value.ljust(width) for value, width in zip(row, widths)) + '  ' + row[-1]
+        for row in rows
+    )
@@ -0,0 +1,94 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Checking for utility images in local storage and pulling them before they are run.
+"""
+
+from subprocess import check_call, check_output, CalledProcessError, DEVNULL, STDOUT
+
+from prodmgr.errors import ProdmgrError
+from prodmgr.metrics import METRICS
+from prodmgr.runner import run_parallel
+
+
+def image_exists(image):
+    """Check whether an image is in local container storage.
+
+    Args:
+        image (str): The full reference of the image.
+
+    Returns:
+        bool: True if the image is present, otherwise False, including if
+            podman could not be run.
+    """
+    try:
+        check_call(['podman', 'image', 'exists', image], stdout=DEVNULL, stderr=DEVNULL)
+    except (CalledProcessError, OSError):
+        return False
+    return True
+
+
+def pull_image(image):
+    """Pull an image into local container storage.
+
+    Args:
+        image (str): The full reference of the image.
+
+    Raises:
+        ProdmgrError: if the image could not be pulled.
+    """
+    try:
+        with METRICS.timer('prodmgr_image_pull_seconds'):
+            check_output(['podman', 'pull', '--quiet', image], stderr=STDOUT, universal_newlines=True)
+    except CalledProcessError as err:
+        raise ProdmgrError(f'Unable to pull {image}: {err.output.strip() or err}')
+    except OSError as err:
+        raise ProdmgrError(f'Unable to pull {image}: {err}')
+
+
+def _ensure_image(image):
+    """Pull an image if it is not in local container storage.
+
+    Returns:
+        bool: True if the image was pulled, False if it was already present.
+    """
+    if image_exists(image):
+        return False
+    pull_image(image)
+    return True
+
+
+def prepull_images(images):
+    """Pull the images which are not in local container storage, concurrently.
+
+    Args:
+        images (iterable of str): The full references of the images. Each
+            image is checked and pulled once, however many times it is given.
+
+    Returns:
+        list of TaskResult: The result for each distinct image, in sorted
+            order. The value is True if the image was pulled and False if it
+            was already present.
+    """
+    return run_parallel(_ensure_image, sorted(set(images)))
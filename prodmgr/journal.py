@@ -0,0 +1,182 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+An append-only journal of the operations run by prodmgr, used to resume
+interrupted runs.
+
+Each line of the journal is a JSON object recording one event of a run:
+
+- run-start: a run of a command started.
+- op-start: an operation, such as deleting one product version, started.
+- op-end: an operation ended with a result. The state of the product
+  version the operation changed, read after it ended, is recorded with it.
+- run-end: a run ended with a result.
+
+Every event is flushed to disk before prodmgr continues, so the journal
+records every operation that ended before the run was interrupted.
+"""
+
+from collections import namedtuple
+from datetime import datetime
+import json
+import os
+import threading
+from uuid import uuid4
+
+from prodmgr.errors import ProdmgrError
+
+ResumePoint = namedtuple('ResumePoint', ['run', 'completed'])
+
+
+def find_resumable(journal_file, command):
+    """Find the operations completed by the last run of a command.
+
+    The last run is used whatever its result, so that an operation which
+    succeeded is skipped when a run which was interrupted, failed or
+    succeeded is repeated, for example by a script of single deletions.
+
+    Args:
+        journal_file (str): The journal file.
+        command (str): The command, as passed to Journal.
+
+    Returns:
+        ResumePoint: The ID of the run and a dictionary of the operations it
+            completed to the state recorded when each ended, or None if there
+            is no run of the command.
+
+    Raises:
+        ProdmgrError: if the journal could not be read.
+    """
+    runs = {}
+    last_run = None
+    try:
+        with open(journal_file) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # The last line may be partial if prodmgr was killed while writing it.
+                    continue
+                if event['event'] == 'run-start':
+                    if event['command'] == command:
+                        last_run = event['run']
+                        runs[last_run] = {}
+                elif event['run'] in runs and event['event'] == 'op-end' and event['result'] == 'succeeded':
+                    runs[event['run']][event['op']] = event.get('state')
+    except FileNotFoundError:
+        return None
+    except OSError as err:
+        raise ProdmgrError(f'Unable to read journal {journal_file}: {err}')
+
+    if last_run is None:
+        return None
+    return ResumePoint(last_run, runs[last_run])
+
+
+class Journal:
+    """The journal of a single run of prodmgr."""
+
+    def __init__(self, journal_file, command, resume_point=None):
+        """Create a new Journal.
+
+        Args:
+            journal_file (str): The journal file to append to.
+            command (str): A description of the command run, which identifies
+                the runs which may be resumed by later runs.
+            resume_point (ResumePoint): The run being resumed, if any.
+        """
+        self.journal_file = journal_file
+        self.command = command
+        self.resume_point = resume_point
+        self.run = uuid4().hex
+        self._lock = threading.Lock()
+
+    def _append(self, event, **fields):
+        """Append an event to the journal and flush it to disk.
+
+        Raises:
+            ProdmgrError: if the journal could not be written.
+        """
+        record = dict(time=datetime.now().isoformat(), run=self.run, event=event, **fields)
+        with self._lock:
+            try:
+                with open(self.journal_file, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as err:
+                raise ProdmgrError(f'Unable to write journal {self.journal_file}: {err}')
+
+    def start_run(self):
+        """Record the start of the run."""
+        self._append('run-start', command=self.command,
+                     resumes=self.resume_point.run if self.resume_point else None)
+
+    def end_run(self, result):
+        """Record the end of the run.
+
+        Args:
+            result (str): The result of the run, 'succeeded' or 'failed'.
+        """
+        self._append('run-end', result=result)
+
+    def start_op(self, op):
+        """Record the start of an operation.
+
+        Args:
+            op (str): A description of the operation, unique within the run.
+        """
+        self._append('op-start', op=op)
+
+    def end_op(self, op, result, state, skipped=False):
+        """Record the end of an operation.
+
+        Args:
+            op (str): The operation.
+            result (str): The result of the operation, 'succeeded' or 'failed'.
+            state (str): The state of the product version changed by the
+                operation, read after it ended.
+            skipped (bool): True if the operation was not run because it was
+                completed by the run being resumed.
+        """
+        self._append('op-end', op=op, result=result, state=state, skipped=skipped)
+
+    def is_completed(self, op, state):
+        """Check whether an operation was completed by the run being resumed.
+
+        An operation is only considered complete if the product version it
+        changed is in the same state as when it ended, so any change made to
+        that version since, by the interrupted run or otherwise, causes it to
+        be run again. Changes to other product versions do not.
+
+        Args:
+            op (str): The operation.
+            state (str): The current state of the product version.
+
+        Returns:
+            bool: True if the operation may be skipped.
+        """
+        if not self.resume_point or state is None:
+            return False
+        return self.resume_point.completed.get(op) == state
@@ -24,31 +24,49 @@
 """
 Main entry point for prodmgr.
 """
+import hashlib
+import json
+import mmap
 import os
 import logging
+import re
+import sqlite3
 import sys
+import threading
+import time
 
-from subprocess import check_call, check_output, CalledProcessError, STDOUT
+from argparse import Namespace
+from subprocess import check_call, check_output, CalledProcessError, DEVNULL, PIPE, Popen, STDOUT, TimeoutExpired
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from uuid import uuid4
 from yaml import safe_load, YAMLError
 from prodmgr.parser import create_parser
 from datetime import datetime
-from prodmgr.constants import DEFAULT_LOG_DIR
+from prodmgr.constants import DEFAULT_HISTORY_INDEX_FILE, DEFAULT_JOURNAL_FILE, DEFAULT_LOG_DIR
+from prodmgr.diff import diff_catalogs, format_changes
+from prodmgr.errors import ProdmgrError
+from prodmgr.history import format_runs, query_runs, record_run
+from prodmgr.images import prepull_images
+from prodmgr.journal import find_resumable, Journal
+from prodmgr.metrics import METRICS
+from prodmgr.model import Catalog
+from prodmgr.prune import parse_keep_overrides, plan_prune
+from prodmgr.runner import format_report, Outcome, run_parallel
+from prodmgr.targets import resolve_targets, target_log_file
+from prodmgr.versions import is_version_selector, VersionIndex
 
 LOGGER = logging.getLogger('prodmgr')
 logfile = ''
+# Catalog files at least this large are memory-mapped rather than read.
+CATALOG_FILE_MMAP_THRESHOLD = 1024 * 1024
+# Seconds to wait for podman itself when stopping and removing a container.
+PODMAN_COMMAND_TIMEOUT = 30
 
 
-class ProdmgrError(Exception):
-    """Something failed in the prodmgr script."""
-    pass
-
-
-def _setup_logging(product, version, action):
+def _setup_console_logging():
     """ Setup stdout logging for this script """
     LOGGER.setLevel(logging.DEBUG)
-    global logfile
 
-    # set the console logger
     console_handler = logging.StreamHandler(sys.stdout)
     console_formatter = logging.Formatter(
         '%(name)s - %(levelname)s - %(message)s')
@@ -56,19 +74,30 @@ def _setup_logging(product, version, action):
     console_handler.setFormatter(console_formatter)
     LOGGER.addHandler(console_handler)
 
+
+def _setup_logging(product, version, action):
+    """ Setup stdout and file logging for this script
+
+    The product and version may be None for actions on more than one product.
+    """
+    global logfile
+
+    # set the console logger
+    _setup_console_logging()
+
     # set the file logger
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    logfile = f'{action}-{product}-{version}-' + timestamp
+    # The version may be a selector such as "<2.4.0", which is not usable in a file name.
+    name_parts = [action, product, version and re.sub(r'[^\w.+-]', '_', version)]
+    logfile = '-'.join(part for part in name_parts if part) + '-' + timestamp
 
-    if not os.path.exists(DEFAULT_LOG_DIR):
-        try:
-            os.makedirs(DEFAULT_LOG_DIR)
-            logfile = os.path.join(DEFAULT_LOG_DIR, logfile)
-        except OSError as error:
-            LOGGER.debug(f"Using current directory {os.getcwd()} for log file")
-            logfile = os.path.join(os.getcwd(), logfile)
-    else:
+    try:
+        # Another prodmgr run starting at the same time may create the directory first.
+        os.makedirs(DEFAULT_LOG_DIR, exist_ok=True)
         logfile = os.path.join(DEFAULT_LOG_DIR, logfile)
+    except OSError as error:
+        LOGGER.debug(f"Using current directory {os.getcwd()} for log file")
+        logfile = os.path.join(os.getcwd(), logfile)
 
     file_handler = logging.FileHandler(filename=logfile)
     file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')  # noqa: E501
@@ -77,40 +106,133 @@ def _setup_logging(product, version, action):
     LOGGER.addHandler(file_handler)
 
 
-def read_catalog(product_catalog_name, product_catalog_namespace):
-    """Read the product catalog and return data for each product version.
+def _get_config_map_data(config_map, config_map_name):
+    """Get the product catalog data from a loaded ConfigMap.
+
+    Args:
+        config_map (dict): The ConfigMap.
+        config_map_name (str): A description of where the ConfigMap came from.
+
+    Returns:
+        dict: A dictionary of product names to unparsed YAML strings.
+    """
+    if not isinstance(config_map, dict) or not config_map.get('data'):
+        raise ProdmgrError(f'{config_map_name} has no data under "data" key')
+    return config_map['data']
+
+
+def get_config_map_output(product_catalog_name, product_catalog_namespace, kube_config=None,
+                          output_format='yaml'):
+    """Get the product catalog ConfigMap as output by kubectl.
 
     Args:
         product_catalog_name (str): The name of the Kubernetes config map
             containing the product catalog.
         product_catalog_namespace (str): The namespace of the Kubernetes config
             map containing the product catalog.
+        kube_config (str): The kubeconfig file for the cluster to read the
+            product catalog from. If not given, kubectl's default is used.
+        output_format (str): The kubectl output format, 'yaml' or 'json'.
 
     Returns:
-        dict: A dictionary of product names to dictionaries of version numbers
-            to sub-component data.
+        bytes: The output of kubectl.
     """
-    config_map_name = f'ConfigMap {product_catalog_namespace}/{product_catalog_name}'
+    kubectl_command = ['kubectl', 'get', 'configmap', f'--namespace={product_catalog_namespace}',
+                       product_catalog_name, f'--output={output_format}']
+    if kube_config:
+        kubectl_command.append(f'--kubeconfig={kube_config}')
     try:
-        config_map = safe_load(check_output([
-            'kubectl', 'get', 'configmap', f'--namespace={product_catalog_namespace}',
-            product_catalog_name, '--output=yaml'
-        ]).decode())
+        with METRICS.timer('prodmgr_catalog_fetch_seconds'):
+            return check_output(kubectl_command)
     except CalledProcessError as err:
         raise ProdmgrError(
-            f'Unable to to read {config_map_name}: {err}'
+            f'Unable to to read ConfigMap {product_catalog_namespace}/{product_catalog_name}: {err}'
         )
+
+
+def read_catalog_data(product_catalog_name, product_catalog_namespace, kube_config=None):
+    """Read the product catalog without parsing the data for each product.
+
+    Args:
+        product_catalog_name (str): The name of the Kubernetes config map
+            containing the product catalog.
+        product_catalog_namespace (str): The namespace of the Kubernetes config
+            map containing the product catalog.
+        kube_config (str): The kubeconfig file for the cluster to read the
+            product catalog from. If not given, kubectl's default is used.
+
+    Returns:
+        dict: A dictionary of product names to the YAML strings describing
+            their versions.
+    """
+    config_map_name = f'ConfigMap {product_catalog_namespace}/{product_catalog_name}'
+    output = get_config_map_output(product_catalog_name, product_catalog_namespace, kube_config)
+    METRICS.inc('prodmgr_catalog_parsed_bytes_total', len(output))
+    try:
+        config_map = safe_load(output.decode())
     except YAMLError as err:
         raise ProdmgrError(
             f'Failed to load data from {config_map_name}: {err}')
 
-    if not config_map.get('data'):
-        raise ProdmgrError(f'{config_map_name} has no data under "data" key')
+    return _get_config_map_data(config_map, config_map_name)
+
 
+def read_catalog_file(path):
+    """Read a product catalog ConfigMap saved to a file, without parsing the data for each product.
+
+    JSON, as written by "prodmgr snapshot", is loaded with the json module,
+    which is much faster than loading it as YAML. YAML files of at least
+    CATALOG_FILE_MMAP_THRESHOLD bytes are memory-mapped, so that PyYAML reads
+    them in chunks from the page cache rather than from a copy of the whole
+    file.
+
+    Args:
+        path (str): The path to a file containing the output of
+            "kubectl get configmap" in YAML or JSON format.
+
+    Returns:
+        dict: A dictionary of product names to the YAML strings describing
+            their versions.
+    """
+    config_map_name = f'ConfigMap file {path}'
+    try:
+        with METRICS.timer('prodmgr_catalog_fetch_seconds'), open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            METRICS.inc('prodmgr_catalog_parsed_bytes_total', size)
+            is_json = f.read(64).lstrip()[:1] == b'{'
+            f.seek(0)
+            if is_json:
+                config_map = json.loads(f.read())
+            elif size >= CATALOG_FILE_MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+                    config_map = safe_load(contents)
+            else:
+                config_map = safe_load(f.read())
+    except OSError as err:
+        raise ProdmgrError(f'Unable to to read {config_map_name}: {err}')
+    except (YAMLError, ValueError) as err:
+        raise ProdmgrError(
+            f'Failed to load data from {config_map_name}: {err}')
+
+    return _get_config_map_data(config_map, config_map_name)
+
+
+def parse_catalog_data(catalog_data, config_map_name):
+    """Parse the data for each product in the product catalog.
+
+    Args:
+        catalog_data (dict): A dictionary of product names to YAML strings,
+            as returned by read_catalog_data.
+        config_map_name (str): A description of where the data came from.
+
+    Returns:
+        dict: A dictionary of product names to dictionaries of version numbers
+            to sub-component data.
+    """
     try:
         return {
             product_name: safe_load(product_versions)
-            for product_name, product_versions in config_map['data'].items()
+            for product_name, product_versions in catalog_data.items()
         }
     except YAMLError as err:
         raise ProdmgrError(
@@ -118,14 +240,113 @@ def read_catalog(product_catalog_name, product_catalog_namespace):
         )
 
 
+def read_catalog(product_catalog_name, product_catalog_namespace, kube_config=None, catalog_file=None):
+    """Read the product catalog and return data for each product version.
+
+    Args:
+        product_catalog_name (str): The name of the Kubernetes config map
+            containing the product catalog.
+        product_catalog_namespace (str): The namespace of the Kubernetes config
+            map containing the product catalog.
+        kube_config (str): The kubeconfig file for the cluster to read the
+            product catalog from. If not given, kubectl's default is used.
+        catalog_file (str): A file containing a saved product catalog
+            ConfigMap. If given, it is read instead of the live ConfigMap.
+
+    Returns:
+        dict: A dictionary of product names to dictionaries of version numbers
+            to sub-component data.
+    """
+    if catalog_file:
+        return parse_catalog_data(read_catalog_file(catalog_file), f'ConfigMap file {catalog_file}')
+    return parse_catalog_data(
+        read_catalog_data(product_catalog_name, product_catalog_namespace, kube_config),
+        f'ConfigMap {product_catalog_namespace}/{product_catalog_name}'
+    )
+
+
+def version_state(versions, version):
+    """Identify the state of a product version, so that changes to it can be detected.
+
+    Args:
+        versions (dict): The versions of the product in the product catalog,
+            or None if the product is not in the catalog.
+        version (str): The version.
+
+    Returns:
+        str: 'absent' if the version is not in the product catalog, or else a
+            hash of its data.
+    """
+    if not isinstance(versions, dict) or version not in versions:
+        return 'absent'
+    data = json.dumps(versions[version], sort_keys=True, default=str)
+    return 'sha256:' + hashlib.sha256(data.encode()).hexdigest()
+
+
+def read_version_state(product_catalog_name, product_catalog_namespace, product, version,
+                       kube_config=None):
+    """Get the state of a product version in the live product catalog.
+
+    Only the data of the product is parsed, so this is cheaper than reading
+    the whole product catalog.
+
+    Args:
+        product_catalog_name (str): The name of the Kubernetes config map
+            containing the product catalog.
+        product_catalog_namespace (str): The namespace of the Kubernetes config
+            map containing the product catalog.
+        product (str): The name of the product.
+        version (str): The version of the product.
+        kube_config (str): The kubeconfig file for the cluster to read the
+            product catalog from. If not given, kubectl's default is used.
+
+    Returns:
+        str: The state of the version, as returned by version_state, or None
+            if it could not be read.
+    """
+    try:
+        output = get_config_map_output(product_catalog_name, product_catalog_namespace, kube_config,
+                                       output_format='json')
+        product_data = (json.loads(output).get('data') or {}).get(product)
+        return version_state(safe_load(product_data) if product_data else None, version)
+    except (ProdmgrError, OSError, ValueError, AttributeError, YAMLError) as err:
+        LOGGER.warning(f'Unable to read the state of {product}:{version} from ConfigMap '
+                       f'{product_catalog_namespace}/{product_catalog_name}: {err}')
+        return None
+
+
+def resolve_version(catalog, product, version, source=None):
+    """Resolve a version selector such as "latest" or "<2.4.0" to an installed version.
+
+    Args:
+        catalog (Catalog): The product catalog.
+        product (str): The name of the product.
+        version (str): An exact version or a version selector.
+        source (str): A description of where the catalog came from, to
+            include in the log message.
+
+    Returns:
+        str: The exact version, which is version itself if it is not a selector.
+
+    Raises:
+        ProdmgrError: if no installed version matches the selector.
+    """
+    if not is_version_selector(version):
+        return version
+    resolved = VersionIndex({product: catalog.versions(product)}).resolve(product, version)
+    LOGGER.info(f'Resolved version {version} of {product} to {resolved}' + (f' on {source}' if source else ''))
+    return resolved
+
+
 def get_docker_image(docker_image, product, version, product_catalog_name, product_catalog_namespace,
-                     base_name_match=True):
+                     base_name_match=True, catalog_file=None):
     """Find the version of the name Docker image for the specified product and version in the config map.
 
     Args:
         docker_image (str): The name of the Docker image for which to get the version
         product (str): The name of the product for which to get the Docker image's version
-        version (str): The version of the product for which to get the Docker image's version
+        version (str): The version of the product for which to get the Docker image's version,
+            or a version selector such as "latest".
         product_catalog_name (str): The name of the Kubernetes config map
             containing the product catalog.
         product_catalog_namespace (str): The namespace of the Kubernetes config
@@ -139,6 +360,8 @@ def get_docker_image(docker_image, product, version, product_catalog_name, produ
               String from product catalog is '/path/file-name'
               base_name_match=True --> docker_image matched against 'base-name'
               base_name_match=False --> docker_image matched against '/path/base-name'
+        catalog_file (str): A file containing a saved product catalog
+            ConfigMap to use instead of the live one.
 
     Returns:
         tuple: A tuple of:
@@ -148,56 +371,233 @@ def get_docker_image(docker_image, product, version, product_catalog_name, produ
     Raises:
         ProdmgrError when an image is not found
     """
-    installed_products = read_catalog(
-        product_catalog_name, product_catalog_namespace)
-    product_data = installed_products.get(product, {}).get(version, {})
+    catalog = Catalog.from_catalog_data(read_catalog(
+        product_catalog_name, product_catalog_namespace, catalog_file=catalog_file))
+    version = resolve_version(catalog, product, version)
+    return find_docker_image(catalog, docker_image, product, version, base_name_match)
+
+
+def find_docker_image(catalog, docker_image, product, version, base_name_match=True):
+    """Find the version of the named Docker image in already-read product catalog data.
+
+    Args:
+        catalog (Catalog): The product catalog.
+        docker_image (str): The name of the Docker image for which to get the version
+        product (str): The name of the product for which to get the Docker image's version
+        version (str): The version of the product for which to get the Docker image's version
+        base_name_match (bool): see get_docker_image.
+
+    Returns:
+        tuple: A tuple of:
+            - (str): Docker image name
+            - (str): Docker image version
+
+    Raises:
+        ProdmgrError when an image is not found
+    """
+    image = catalog.find_docker_image(docker_image, product, version, base_name_match)
+    return image.name, image.version
+
+
+def get_product_components(catalog, product, version):
+    """Get the components of a product version from already-read product catalog data.
+
+    Args:
+        catalog (Catalog): The product catalog.
+        product (str): The name of the product.
+        version (str): The version of the product.
+
+    Returns:
+        list of tuple: (kind, description) for each component, e.g.
+            ('docker', 'cray/cray-sat:3.12.0').
 
-    if not product_data:
+    Raises:
+        ProdmgrError: if the product version is not in the catalog.
+    """
+    product_version = catalog.get(product, version)
+    if not product_version:
         raise ProdmgrError(
             f'No product information found for {product}:{version}.')
 
-    component_versions = product_data.get('component_versions', {})
-    if not component_versions:
-        raise ProdmgrError(
-            f'No component information found for {product}:{version}.')
+    return [(component.kind, f'{component.name}:{component.version}' if component.version else component.name)
+            for component in product_version.components]
 
-    if base_name_match:
-        if '/' in docker_image:
-            raise ProdmgrError(f'{docker_image} contains an invalid character: /. '
-                               f'For full path search, set base_name_match to False.')
 
-        docker_images = [img for img in component_versions.get('docker', [])
-                         if os.path.basename(img.get('name')) == docker_image]
-    else:
-        docker_images = [img for img in component_versions.get('docker', [])
-                         if img.get('name') == docker_image]
+def _image_reference(args, image_name, image_version):
+    """Get the full reference of a utility image in the container registry.
 
-    if not docker_images:
-        raise ProdmgrError(
-            f'Image {docker_image} not found in product data for {product}:{version}'
-        )
+    Args:
+        args (Namespace): The parsed command-line arguments.
+        image_name (str): The name of the image.
+        image_version (str): The version of the image.
 
-    elif len(docker_images) > 1:
-        raise ProdmgrError(
-            f'Multiple {docker_image} images found in product data for {product}:{version}'
-        )
+    Returns:
+        str: The image reference.
+    """
+    return f'{args.container_registry_hostname}/{image_name}:{image_version}'
 
-    image_name = docker_images[0].get('name')
-    if not image_name:
-        raise ProdmgrError(
-            f'Unable to determine name of image {docker_image} from product data'
-        )
 
-    image_version = docker_images[0].get('version', None)
-    if not image_version:
-        raise ProdmgrError(
-            f'Unable to determine version of image {docker_image} from product data'
-        )
+def _prepull_images(images):
+    """Pull the utility images which are not in local storage before running them.
+
+    The images are pulled concurrently, so that the time taken to pull them
+    is not part of running each container, and is reported separately. An
+    image which could not be pulled is only warned about, as podman run will
+    try to pull it again and report any error.
+
+    Args:
+        images (iterable of str): The full references of the images.
+    """
+    for result in prepull_images(images):
+        if result.error:
+            LOGGER.warning(result.error)
+        elif result.value:
+            LOGGER.info(f'Pulled {result.item} in {result.duration:.1f}s')
+        else:
+            LOGGER.debug(f'Image {result.item} is present')
+
+
+def _read_output(stream, lines, echo):
+    """Read the output of a container until it exits.
+
+    Args:
+        stream (file): The output of the podman run process.
+        lines (list): The list to append each line of output to.
+        echo (bool): If True, also write each line to stdout as it is read.
+    """
+    for line in stream:
+        lines.append(line)
+        if echo:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+
+def _name_container(podman_command):
+    """Get the name of the container run by a podman run command, naming it if needed.
+
+    Args:
+        podman_command (list): The podman run command, without the image and
+            its arguments.
+
+    Returns:
+        tuple: The name of the container and the podman run command using it.
+    """
+    for index, arg in enumerate(podman_command):
+        if arg == '--name' and index + 1 < len(podman_command):
+            return podman_command[index + 1], podman_command
+        if arg.startswith('--name='):
+            return arg.split('=', 1)[1], podman_command
+    name = f'prodmgr-{uuid4().hex}'
+    return name, podman_command[:2] + ['--name', name] + podman_command[2:]
+
+
+def _stop_container(name, kill_grace, process):
+    """Stop and remove a container, and wait for its podman run process to exit.
+
+    podman sends SIGTERM to the container, and SIGKILL if it has not exited
+    after kill_grace seconds. Errors are logged rather than raised, so that
+    the container is removed even if it could not be stopped.
+
+    Args:
+        name (str): The name of the container.
+        kill_grace (int): Seconds to wait after SIGTERM before SIGKILL.
+        process (Popen): The podman run process.
+    """
+    LOGGER.warning(f'Stopping container {name}')
+    try:
+        check_call(['podman', 'stop', '--time', str(kill_grace), name],
+                   stdout=DEVNULL, stderr=STDOUT, timeout=kill_grace + PODMAN_COMMAND_TIMEOUT)
+    except (CalledProcessError, OSError, TimeoutExpired) as err:
+        LOGGER.warning(f'Unable to stop container {name}: {err}')
+    try:
+        process.wait(timeout=PODMAN_COMMAND_TIMEOUT)
+    except TimeoutExpired:
+        process.kill()
+        process.wait()
+    # --rm does not remove a container whose podman run process was killed.
+    try:
+        check_call(['podman', 'rm', '--force', '--ignore', name],
+                   stdout=DEVNULL, stderr=STDOUT, timeout=PODMAN_COMMAND_TIMEOUT)
+    except (CalledProcessError, OSError, TimeoutExpired) as err:
+        LOGGER.warning(f'Unable to remove container {name}: {err}')
+
 
-    return image_name, image_version
+# The containers being run, by name, so that the containers run by worker
+# threads can be stopped when the main thread is interrupted.
+_running_containers = {}
+_containers_lock = threading.Lock()
+_interrupted = threading.Event()
 
 
-def run_deletion_utility(image_name, image_version, args, remaining_args):
+def _stop_running_containers(kill_grace):
+    """Stop and remove every running container, and do not start any more.
+
+    Only the main thread sees a KeyboardInterrupt, so this is called from it
+    for the containers run by worker threads.
+
+    Args:
+        kill_grace (int): Seconds to wait after SIGTERM before SIGKILL.
+    """
+    with _containers_lock:
+        _interrupted.set()
+        containers = list(_running_containers.items())
+    run_parallel(lambda container: _stop_container(container[0], kill_grace, container[1]), containers)
+
+
+def _run_container(image_name, podman_command, container_command, args, echo=False):
+    """Run a utility container, stopping it if it runs for longer than args.timeout.
+
+    Args:
+        image_name (str): The name of the image, for messages.
+        podman_command (list): The podman run command, without the image and
+            its arguments.
+        container_command (list): The image and its arguments.
+        args (Namespace): The parsed command-line arguments.
+        echo (bool): If True, write the output of the container to stdout as
+            it runs.
+
+    Returns:
+        str: The output of the container.
+
+    Raises:
+        CalledProcessError: if the container exited with a non-zero status.
+        ProdmgrError: if the container timed out, or prodmgr was interrupted
+            before it was started.
+    """
+    name, podman_command = _name_container(podman_command)
+    command = podman_command + container_command
+    lines = []
+    with _containers_lock:
+        if _interrupted.is_set():
+            raise ProdmgrError(f'Not running {image_name}, as prodmgr was interrupted')
+        # Undecodable output must not stop the reader, or the container blocks on a full pipe.
+        process = Popen(command, stdout=PIPE, stderr=STDOUT, encoding='utf-8', errors='replace')
+        _running_containers[name] = process
+    try:
+        reader = threading.Thread(target=_read_output, args=(process.stdout, lines, echo), daemon=True)
+        reader.start()
+        try:
+            process.wait(timeout=args.timeout)
+        except (KeyboardInterrupt, TimeoutExpired) as err:
+            _stop_container(name, args.kill_grace, process)
+            reader.join()
+            LOGGER.error(f'Output of {image_name} before it was stopped:\n{"".join(lines)}')
+            if isinstance(err, KeyboardInterrupt):
+                raise
+            raise ProdmgrError(f'Running {image_name} timed out after {args.timeout} seconds')
+        reader.join()
+    finally:
+        with _containers_lock:
+            del _running_containers[name]
+
+    output = ''.join(lines)
+    if process.returncode:
+        raise CalledProcessError(process.returncode, command, output)
+    return output
+
+
+def run_deletion_utility(image_name, image_version, args, remaining_args, log_file=None,
+                         capture_output=False):
     """Invoke the Docker image container.
 
     Args:
@@ -207,6 +607,13 @@ def run_deletion_utility(image_name, image_version, args, remaining_args):
             command-line arguments passed to the command.
         remaining_args (list): List of remaining command-line arguments
             not parsed by parse_known_args().
+        log_file (str): The log file for the container to write to. Defaults
+            to the log file of this prodmgr run.
+        capture_output (bool): If True, return the output of the container
+            instead of letting it go to stdout.
+
+    Returns:
+        str: The output of the container if capture_output is True, else None.
     """
     LOGGER.debug(f'Running {image_name}:{image_version}')
 
@@ -219,30 +626,35 @@ def run_deletion_utility(image_name, image_version, args, remaining_args):
     if args.extra_podman_config:
         podman_command = podman_command + args.extra_podman_config.split(" ")
 
-    container_command = [f'{args.container_registry_hostname}/{image_name}:{image_version}',
+    container_command = [_image_reference(args, image_name, image_version),
                          args.action, args.product, args.version,
                          # --product-catalog-name and --product-catalog-namespace are used both by this
                          # script as well as with the underlying install utility image.
                          f'--product-catalog-name={args.product_catalog_name}',
                          f'--product-catalog-namespace={args.product_catalog_namespace}',
-                         f'--log-file={logfile}',
+                         f'--log-file={log_file or logfile}',
                          f'--dry-run={args.dry_run}'
                          ]
-    deletion_utility_command = podman_command + container_command
 
     # Pass any unrecognized CLI arguments to the container
-    deletion_utility_command.extend(remaining_args)
+    container_command.extend(remaining_args)
     LOGGER.debug(
-        f"Launching deletion utility using - {deletion_utility_command}")
+        f"Launching deletion utility using - {podman_command + container_command}")
 
     try:
-        check_call(
-            deletion_utility_command, universal_newlines=True, stderr=STDOUT)
+        # Label the run with its product, as prune deletes several products in one run.
+        with METRICS.timer('prodmgr_container_run_seconds', product=args.product):
+            output = _run_container(image_name, podman_command, container_command, args,
+                                    echo=not capture_output)
+            if capture_output:
+                return output
     except CalledProcessError as cpe:
+        if capture_output:
+            LOGGER.error(cpe.output)
         raise ProdmgrError(f'Running {image_name} failed: {cpe}')
 
 
-def run_install_utility(image_name, image_version, args, remaining_args):
+def run_install_utility(image_name, image_version, args, remaining_args, capture_output=False):
     """Invoke the Docker image container.
 
     Args:
@@ -252,6 +664,11 @@ def run_install_utility(image_name, image_version, args, remaining_args):
             command-line arguments passed to the command.
         remaining_args (list): List of remaining command-line arguments
             not parsed by parse_known_args().
+        capture_output (bool): If True, return the output of the container
+            instead of logging it.
+
+    Returns:
+        str: The output of the container if capture_output is True, else None.
     """
     LOGGER.debug(f'Running {image_name}:{image_version}')
 
@@ -263,59 +680,604 @@ def run_install_utility(image_name, image_version, args, remaining_args):
     if args.extra_podman_config:
         podman_command = podman_command + args.extra_podman_config.split(" ")
 
-    container_command = [f'{args.container_registry_hostname}/{image_name}:{image_version}',
+    container_command = [_image_reference(args, image_name, image_version),
                          args.action, args.version,
                          # --product-catalog-name and --product-catalog-namespace are used both by this
                          # script as well as with the underlying install utility image.
                          f'--product-catalog-name={args.product_catalog_name}',
                          f'--product-catalog-namespace={args.product_catalog_namespace}'
                          ]
-    install_utility_command = podman_command + container_command
 
     # Pass any unrecognized CLI arguments to the container
-    install_utility_command.extend(remaining_args)
+    container_command.extend(remaining_args)
     LOGGER.debug(
-        f"Launching install utility using - {install_utility_command}")
+        f"Launching install utility using - {podman_command + container_command}")
 
     try:
-        install_result = check_output(
-            install_utility_command, universal_newlines=True, stderr=STDOUT)
+        with METRICS.timer('prodmgr_container_run_seconds'):
+            install_result = _run_container(image_name, podman_command, container_command, args)
     except CalledProcessError as cpe:
         LOGGER.error(cpe.output)
         raise ProdmgrError(f'Running {image_name} failed: {cpe}')
     else:
+        if capture_output:
+            return install_result
         LOGGER.info(install_result)
 
 
+def _skip_completed(journal, op, read_state):
+    """Check whether an operation was completed by the run being resumed.
+
+    A skipped operation is recorded as completed by this run too, so that it
+    is also skipped if this run is interrupted and resumed.
+
+    Args:
+        journal (Journal): The journal of this run, or None.
+        op (str): The operation.
+        read_state (callable): Returns the current state of the product
+            version changed by the operation.
+
+    Returns:
+        bool: True if the operation should be skipped.
+    """
+    if journal is None or journal.resume_point is None:
+        return False
+    state = read_state()
+    if not journal.is_completed(op, state):
+        return False
+    LOGGER.info(f'Skipping {op}, completed by run {journal.resume_point.run}')
+    journal.end_op(op, 'succeeded', state, skipped=True)
+    return True
+
+
+def _run_operation(journal, op, read_state, operation):
+    """Run an operation, recording its start and end in the journal.
+
+    Args:
+        journal (Journal): The journal of this run, or None to not record
+            the operation.
+        op (str): The operation.
+        read_state (callable): Returns the current state of the product
+            version changed by the operation.
+        operation (callable): Runs the operation.
+
+    Returns:
+        The value returned by operation.
+    """
+    if journal is None:
+        return operation()
+    journal.start_op(op)
+    result = 'failed'
+    try:
+        value = operation()
+        result = 'succeeded'
+        return value
+    finally:
+        journal.end_op(op, result, read_state())
+
+
+def _run_on_target(target, catalog, args, remaining_args, journal=None):
+    """Run the requested action against a single target cluster.
+
+    Args:
+        target (Target): The cluster to operate on.
+        catalog (Catalog): The product catalog read from the target.
+        args (Namespace): The parsed command-line arguments.
+        remaining_args (list): Command-line arguments for the container.
+        journal (Journal): The journal of this run, or None.
+
+    Returns:
+        Outcome: The result of the action on the target.
+    """
+    try:
+        version = resolve_version(catalog, args.product, args.version, target.name)
+    except ProdmgrError as err:
+        return Outcome('skipped', str(err), '')
+    if not catalog.get(args.product, version):
+        return Outcome('skipped', f'{args.product}:{version} is not installed', '')
+
+    op = f'{args.action.lower()} {args.product}:{version} on {target.name}'
+
+    def read_state():
+        return read_version_state(args.product_catalog_name, args.product_catalog_namespace,
+                                  args.product, version, kube_config=target.kube_config)
+
+    if _skip_completed(journal, op, read_state):
+        return Outcome('skipped', f'completed by run {journal.resume_point.run}', '')
+
+    target_args = Namespace(**vars(args))
+    target_args.kube_config_src_file = target.kube_config
+    target_args.version = version
+    if args.action.lower() == 'activate':
+        image_name, image_version = find_docker_image(catalog, f'{args.product}-install-utility',
+                                                      args.product, version)
+        log_file = logfile
+
+        def operation():
+            return run_install_utility(image_name, image_version, target_args, remaining_args,
+                                       capture_output=True)
+    else:
+        image_name, image_version = args.deletion_image_name, args.deletion_image_version
+        log_file = target_log_file(logfile, target)
+
+        def operation():
+            return run_deletion_utility(image_name, image_version, target_args, remaining_args,
+                                        log_file=log_file, capture_output=True)
+
+    # Each target is recorded in the history index with the version resolved
+    # from its own catalog, which may differ between targets. Dry runs are
+    # not recorded, as they change nothing.
+    started = datetime.now()
+    start_time = time.monotonic()
+    exit_status = 1
+    try:
+        output = _run_operation(journal, op, read_state, operation)
+        exit_status = 0
+    finally:
+        if not args.dry_run:
+            _record_history(args.action.lower(), args.product, version, started, time.monotonic() - start_time,
+                            exit_status, f'{image_name}:{image_version}', log_file)
+    return Outcome('succeeded', '' if version == args.version else f'version {version}', output)
+
+
+def _install_utility_image(catalog, args):
+    """Get the install utility image which activate would run on a target.
+
+    Args:
+        catalog (Catalog): The product catalog read from the target.
+        args (Namespace): The parsed command-line arguments.
+
+    Returns:
+        str: The full reference of the image, or None if the product version
+            or its install utility is not in the catalog. That is reported
+            when the action is run on the target.
+    """
+    try:
+        version = VersionIndex.from_catalog(catalog).resolve(args.product, args.version)
+        return _image_reference(args, *find_docker_image(catalog, f'{args.product}-install-utility',
+                                                         args.product, version))
+    except ProdmgrError:
+        return None
+
+
+def run_multi_target(args, remaining_args, journal=None):
+    """Run the requested action against each target cluster in parallel.
+
+    The product catalog of every target is read first, concurrently, and the
+    action is then run only on the targets where the product version is
+    installed.
+
+    Args:
+        args (Namespace): The parsed command-line arguments.
+        remaining_args (list): Command-line arguments for the container.
+        journal (Journal): The journal of this run, or None.
+
+    Raises:
+        ProdmgrError: if the targets could not be resolved, or the action
+            failed on any target.
+    """
+    with TemporaryDirectory(prefix='prodmgr-') as kube_config_dir:
+        targets = resolve_targets(args.target, args.target_context,
+                                  args.kube_config_src_file, kube_config_dir)
+        LOGGER.info(f'Reading product catalog from {len(targets)} targets')
+        catalogs = {
+            result.item: result for result in run_parallel(
+                lambda target: Catalog.from_catalog_data(read_catalog(
+                    args.product_catalog_name, args.product_catalog_namespace, kube_config=target.kube_config
+                )),
+                targets
+            )
+        }
+
+        if args.action.lower() == 'activate':
+            images = [_install_utility_image(catalogs[target].value, args) for target in targets
+                      if not catalogs[target].error]
+            _prepull_images(image for image in images if image)
+        else:
+            _prepull_images([_image_reference(args, args.deletion_image_name, args.deletion_image_version)])
+
+        def run_target(target):
+            if catalogs[target].error:
+                raise catalogs[target].error
+            return _run_on_target(target, catalogs[target].value, args, remaining_args, journal)
+
+        LOGGER.info(f'Running {args.action} {args.product}:{args.version} on {len(targets)} targets')
+        results = run_parallel(run_target, targets,
+                               on_interrupt=lambda: _stop_running_containers(args.kill_grace))
+
+    for result in results:
+        if result.value and result.value.output:
+            LOGGER.info(f'Output from {result.item.name}:\n{result.value.output}')
+    report = format_report(results, 'TARGET')
+    LOGGER.info(f'Results of {args.action} {args.product}:{args.version}:\n{report}')
+
+    failed = [result.item.name for result in results if result.error]
+    if failed:
+        raise ProdmgrError(f'{args.action} failed on {len(failed)} of {len(results)} targets: '
+                           f'{", ".join(failed)}')
+
+
+def run_diff(args):
+    """Print the differences between two product catalogs.
+
+    Args:
+        args (Namespace): The parsed command-line arguments.
+    """
+    old_catalog_data = read_catalog_file(args.old_catalog)
+    if args.new_catalog:
+        new_source = args.new_catalog
+        new_catalog_data = read_catalog_file(args.new_catalog)
+    else:
+        new_source = f'ConfigMap {args.product_catalog_namespace}/{args.product_catalog_name}'
+        new_catalog_data = read_catalog_data(args.product_catalog_name, args.product_catalog_namespace)
+
+    changes = diff_catalogs(old_catalog_data, new_catalog_data, args.old_catalog, new_source)
+    if changes:
+        print(format_changes(changes))
+    else:
+        LOGGER.info(f'No differences between {args.old_catalog} and {new_source}')
+
+
+def run_snapshot(args):
+    """Save the live product catalog ConfigMap to a file.
+
+    The file is replaced atomically, so an existing snapshot is never left
+    partially written.
+
+    Args:
+        args (Namespace): The parsed command-line arguments.
+    """
+    output = get_config_map_output(args.product_catalog_name, args.product_catalog_namespace,
+                                   output_format=args.format)
+    target_dir = os.path.dirname(os.path.abspath(args.file))
+    try:
+        f = NamedTemporaryFile(dir=target_dir, prefix='.prodmgr-snapshot-', delete=False)
+    except OSError as err:
+        raise ProdmgrError(f'Unable to write product catalog snapshot {args.file}: {err}')
+    try:
+        with f:
+            f.write(output)
+        # NamedTemporaryFile creates the file readable by its owner only.
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, args.file)
+    except OSError as err:
+        os.remove(f.name)
+        raise ProdmgrError(f'Unable to write product catalog snapshot {args.file}: {err}')
+    LOGGER.info(f'Saved ConfigMap {args.product_catalog_namespace}/{args.product_catalog_name} '
+                f'to {args.file} ({len(output)} bytes)')
+
+
+def run_history(args):
+    """Print runs from the history index.
+
+    Args:
+        args (Namespace): The parsed command-line arguments.
+    """
+    if not os.path.exists(args.index_file):
+        raise ProdmgrError(f'History index {args.index_file} does not exist')
+    try:
+        runs = query_runs(args.index_file, action=args.filter_action, product=args.product,
+                          version=args.version, failed=args.failed, since=args.since, limit=args.limit)
+    except sqlite3.Error as err:
+        raise ProdmgrError(f'Unable to read history index {args.index_file}: {err}')
+    if runs:
+        print(format_runs(runs))
+    else:
+        LOGGER.info('No matching runs found')
+
+
+def _prune_version(candidate, args, remaining_args, journal=None):
+    """Delete a product version selected by prune.
+
+    Args:
+        candidate (PruneCandidate): The product version to delete.
+        args (Namespace): The parsed command-line arguments.
+        remaining_args (list): Command-line arguments for the container.
+        journal (Journal): The journal of this run, or None.
+
+    Returns:
+        Outcome: The result of the deletion.
+    """
+    delete_args = Namespace(**vars(args))
+    delete_args.action = 'delete'
+    delete_args.product = candidate.product
+    delete_args.version = candidate.version
+    delete_args.dry_run = False
+    image = f'{args.deletion_image_name}:{args.deletion_image_version}'
+    log_file = f'{logfile}-{candidate.product}-{candidate.version}'
+
+    started = datetime.now()
+    start_time = time.monotonic()
+    exit_status = 1
+    try:
+        output = _run_operation(
+            journal, f'delete {candidate.name}',
+            lambda: read_version_state(args.product_catalog_name, args.product_catalog_namespace,
+                                       candidate.product, candidate.version,
+                                       kube_config=args.kube_config_src_file),
+            lambda: run_deletion_utility(args.deletion_image_name, args.deletion_image_version,
+                                         delete_args, remaining_args, log_file=log_file, capture_output=True)
+        )
+        exit_status = 0
+    finally:
+        _record_history('prune', candidate.product, candidate.version, started,
+                        time.monotonic() - start_time, exit_status, image, log_file)
+    return Outcome('deleted', '', output)
+
+
+def run_prune(args, remaining_args, journal=None):
+    """Delete all but the newest versions of each product.
+
+    The versions to delete are found from a single read of the product
+    catalog, and then deleted by at most args.workers deletion utility
+    containers at a time.
+
+    Args:
+        args (Namespace): The parsed command-line arguments.
+        remaining_args (list): Command-line arguments for the container.
+        journal (Journal): The journal of this run, or None.
+
+    Raises:
+        ProdmgrError: if the options are invalid, or any deletion failed.
+    """
+    keep_by_product = parse_keep_overrides(args.keep_product)
+    if args.keep < 0:
+        raise ProdmgrError('--keep must not be negative')
+    if args.workers < 1:
+        raise ProdmgrError('--workers must be at least 1')
+
+    catalog_data = read_catalog(args.product_catalog_name, args.product_catalog_namespace,
+                                catalog_file=args.catalog_file)
+    catalog = Catalog.from_catalog_data(catalog_data)
+    candidates = plan_prune(catalog, args.keep, keep_by_product, args.product)
+    if not candidates:
+        LOGGER.info('No product versions to prune')
+        return
+    LOGGER.info('Product versions to delete:\n' +
+                '\n'.join(f'    {candidate.name}' for candidate in candidates))
+    if args.dry_run:
+        return
+
+    if journal and journal.resume_point:
+        # The catalog was read just now, so the state of each version is taken from it.
+        candidates = [candidate for candidate in candidates
+                      if not _skip_completed(journal, f'delete {candidate.name}',
+                                             lambda: version_state(catalog_data.get(candidate.product),
+                                                                   candidate.version))]
+        if not candidates:
+            LOGGER.info('All product versions were deleted by the resumed run')
+            return
+
+    _prepull_images([_image_reference(args, args.deletion_image_name, args.deletion_image_version)])
+    LOGGER.info(f'Deleting {len(candidates)} product versions with up to {args.workers} workers')
+    results = run_parallel(lambda candidate: _prune_version(candidate, args, remaining_args, journal),
+                           candidates, max_workers=args.workers,
+                           on_interrupt=lambda: _stop_running_containers(args.kill_grace))
+
+    for result in results:
+        if result.value and result.value.output:
+            LOGGER.info(f'Output from deleting {result.item.name}:\n{result.value.output}')
+    report = format_report(results, 'VERSION')
+    LOGGER.info(f'Results of prune:\n{report}')
+
+    failed = [result.item.name for result in results if result.error]
+    if failed:
+        raise ProdmgrError(f'Deleting {len(failed)} of {len(results)} product versions failed: '
+                           f'{", ".join(failed)}')
+
+
+# Actions which do not operate on a product. These log to the console only
+# and do not accept arguments for a utility container.
+QUERY_ACTIONS = {
+    'diff': run_diff,
+    'history': run_history,
+    'snapshot': run_snapshot,
+}
+
+
+def run_product_action(args, remaining_args, journal=None):
+    """Run a utility container to operate on a product version.
+
+    Args:
+        args (Namespace): The parsed command-line arguments.
+        remaining_args (list): Command-line arguments for the container.
+        journal (Journal): The journal of this run, or None.
+
+    Returns:
+        str: The utility image run, or None if no image was run or different
+            images were run on multiple targets.
+    """
+    if args.action.lower() == 'activate':
+        LOGGER.warning('The "activate" action is deprecated.')
+    elif args.action.lower() == 'uninstall':
+        LOGGER.warning('The "uninstall" action is deprecated.')
+
+    if args.target or args.target_context:
+        if args.catalog_file:
+            raise ProdmgrError('--catalog-file cannot be used with --target or --target-context')
+        run_multi_target(args, remaining_args, journal)
+        if args.action.lower() == 'activate':
+            return None
+        return f'{args.deletion_image_name}:{args.deletion_image_version}'
+
+    catalog = None
+    if args.action.lower() == 'activate' or args.catalog_file or is_version_selector(args.version):
+        catalog = Catalog.from_catalog_data(read_catalog(args.product_catalog_name,
+                                                         args.product_catalog_namespace,
+                                                         catalog_file=args.catalog_file))
+        args.version = resolve_version(catalog, args.product, args.version)
+
+    op = f'{args.action.lower()} {args.product}:{args.version}'
+
+    # The utility container changes the product catalog of the cluster it is
+    # given, which may not be kubectl's default.
+    def read_state():
+        return read_version_state(args.product_catalog_name, args.product_catalog_namespace,
+                                  args.product, args.version, kube_config=args.kube_config_src_file)
+
+    if _skip_completed(journal, op, read_state):
+        return None
+
+    if args.action.lower() == 'activate':
+        docker_image_to_find = f'{args.product}-install-utility'
+        # Find the image version.
+        image_name, image_version = find_docker_image(catalog, docker_image_to_find,
+                                                      args.product, args.version)
+        _prepull_images([_image_reference(args, image_name, image_version)])
+        _run_operation(journal, op, read_state,
+                       lambda: run_install_utility(image_name, image_version, args, remaining_args))
+        return f'{image_name}:{image_version}'
+    else:
+        if args.catalog_file:
+            # The deletion utility reads the live catalog, so plan from the
+            # catalog file without running it. main() only allows a catalog
+            # file with --dry-run.
+            components = get_product_components(catalog, args.product, args.version)
+            LOGGER.info(f'Components of {args.product}:{args.version} in {args.catalog_file}:\n' +
+                        '\n'.join(f'    {kind}: {description}' for kind, description in components))
+            return None
+        image_name = args.deletion_image_name
+        image_version = args.deletion_image_version
+        _prepull_images([_image_reference(args, image_name, image_version)])
+        _run_operation(journal, op, read_state,
+                       lambda: run_deletion_utility(image_name, image_version, args, remaining_args))
+    return f'{args.deletion_image_name}:{args.deletion_image_version}'
+
+
+def _write_metrics(metrics_file, result):
+    """Record the result of this run and write the metrics textfile.
+
+    Args:
+        metrics_file (str): The textfile to write, or None to not write one.
+        result (str): The result of the run, 'success' or 'failure'.
+    """
+    if not metrics_file:
+        return
+    METRICS.inc('prodmgr_operations_total', result=result)
+    try:
+        METRICS.write_textfile(metrics_file)
+    except OSError as err:
+        LOGGER.warning(f'Unable to write metrics to {metrics_file}: {err}')
+
+
+def _record_history(action, product, version, started, duration, exit_status, image, log_file):
+    """Add a run to the history index in the log directory.
+
+    Args:
+        action (str): The action run.
+        product (str): The product operated on.
+        version (str): The version of the product operated on.
+        started (datetime): When the run started.
+        duration (float): The time taken by the run in seconds.
+        exit_status (int): The exit status of the run.
+        image (str): The utility image run, if any.
+        log_file (str): The log file of the run.
+    """
+    index_file = os.path.join(os.path.dirname(logfile), os.path.basename(DEFAULT_HISTORY_INDEX_FILE))
+    try:
+        record_run(index_file, started, action, product, version, image,
+                   duration, exit_status, log_file)
+    except sqlite3.Error as err:
+        LOGGER.warning(f'Unable to update history index {index_file}: {err}')
+
+
+def _open_journal(args):
+    """Start the journal of this run in the log directory.
+
+    Args:
+        args (Namespace): The parsed command-line arguments.
+
+    Returns:
+        Journal: The journal of this run.
+
+    Raises:
+        ProdmgrError: if the journal could not be read or written.
+    """
+    journal_file = os.path.join(os.path.dirname(logfile), os.path.basename(DEFAULT_JOURNAL_FILE))
+    if args.action == 'prune':
+        command = args.action
+    else:
+        command = f'{args.action.lower()} {args.product} {args.version}'
+
+    resume_point = None
+    if args.resume:
+        resume_point = find_resumable(journal_file, command)
+        if resume_point:
+            LOGGER.info(f'Resuming run {resume_point.run}, which completed '
+                        f'{len(resume_point.completed)} operations')
+        else:
+            LOGGER.info(f'No earlier run of "{command}" to resume')
+    journal = Journal(journal_file, command, resume_point)
+    journal.start_run()
+    return journal
+
+
 def main(*args):
     """Main method."""
     parser = create_parser()
     # Parse arguments that are known to the script, but other arguments
     # are assumed to belong to the underlying container script.
     args, remaining_args = parser.parse_known_args()
-    _setup_logging(args.product, args.version, args.action.lower())
+    product_action = args.action not in QUERY_ACTIONS and args.action != 'prune'
+    if args.action not in QUERY_ACTIONS:
+        if args.resume and args.dry_run:
+            parser.error('--resume cannot be used with --dry-run')
+        if args.timeout is not None and args.timeout < 1:
+            parser.error('--timeout must be at least 1')
+        if args.kill_grace < 0:
+            parser.error('--kill-grace must not be negative')
+    # The deletion utility always changes the live product catalog, which a
+    # saved catalog may not match.
+    if args.action.lower() in ('delete', 'uninstall', 'prune') and args.catalog_file and not args.dry_run:
+        parser.error(f'--catalog-file can only be used with {args.action.lower()} --dry-run')
+    if args.action in QUERY_ACTIONS:
+        if remaining_args:
+            parser.error(f'unrecognized arguments: {" ".join(remaining_args)}')
+        _setup_console_logging()
+    elif args.action == 'prune':
+        _setup_logging(None, None, args.action)
+    else:
+        _setup_logging(args.product, args.version, args.action.lower())
+    METRICS.set_labels(action=args.action.lower(), product=args.product if product_action else '')
+
+    started = datetime.now()
+    start_time = time.monotonic()
+    image = None
+    journal = None
+    result = 'failure'
     try:
-        if args.action.lower() == 'activate':
-            LOGGER.warning('The "activate" action is deprecated.')
-            docker_image_to_find = f'{args.product}-install-utility'
-            # Find the image version.
-            image_name, image_version = get_docker_image(docker_image_to_find,
-                                                         args.product,
-                                                         args.version,
-                                                         args.product_catalog_name,
-                                                         args.product_catalog_namespace)
-            run_install_utility(image_name, image_version,
-                                args, remaining_args)
+        # Dry runs are not journaled, as they complete no operations.
+        if args.action not in QUERY_ACTIONS and not args.dry_run:
+            journal = _open_journal(args)
+        if args.action in QUERY_ACTIONS:
+            QUERY_ACTIONS[args.action](args)
+        elif args.action == 'prune':
+            run_prune(args, remaining_args, journal)
         else:
-            if args.action.lower() == 'uninstall':
-                LOGGER.warning('The "uninstall" action is deprecated.')
-            image_name = args.deletion_image_name
-            image_version = args.deletion_image_version
-            run_deletion_utility(image_name, image_version,
-                                 args, remaining_args)
+            image = run_product_action(args, remaining_args, journal)
+        result = 'success'
     except ProdmgrError as err:
         LOGGER.critical(err)
         raise SystemExit(1)
+    except KeyboardInterrupt:
+        # Any utility containers were stopped and removed when it was raised.
+        LOGGER.critical('Interrupted')
+        raise SystemExit(130)
+    finally:
+        _write_metrics(args.metrics_file, result)
+        if journal:
+            try:
+                journal.end_run('succeeded' if result == 'success' else 'failed')
+            except ProdmgrError as err:
+                LOGGER.warning(err)
+        # Each deletion run by prune, and each target of a multi-target run,
+        # is recorded separately. Dry runs are not recorded, so that the
+        # history only lists changes which were made.
+        if product_action and not args.dry_run and not (args.target or args.target_context):
+            if result == 'failure' and args.action.lower() != 'activate':
+                image = f'{args.deletion_image_name}:{args.deletion_image_version}'
+            _record_history(args.action.lower(), args.product, args.version, started,
+                            time.monotonic() - start_time, 0 if result == 'success' else 1, image, logfile)
 
 
 if "__main__" == __name__:
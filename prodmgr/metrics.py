@@ -0,0 +1,237 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Prometheus metrics for prodmgr, written to a node-exporter textfile.
+
+Each prodmgr run records its metrics in memory and adds them to the values
+already in the textfile when it exits, so the counters and histograms in the
+file accumulate over all runs. The file is replaced atomically under a lock,
+so the node exporter never sees a partial file and concurrent runs do not
+lose each other's updates.
+"""
+
+from contextlib import contextmanager
+import fcntl
+import math
+import os
+import re
+from tempfile import NamedTemporaryFile
+import threading
+import time
+
+# The metric families recorded by prodmgr, by name: (type, help).
+METRIC_FAMILIES = {
+    'prodmgr_operations_total': ('counter', 'Number of prodmgr operations by action, product and result.'),
+    'prodmgr_catalog_fetch_seconds': ('histogram', 'Time taken to fetch the product catalog.'),
+    'prodmgr_container_run_seconds': ('histogram', 'Time taken to run a utility container.'),
+    'prodmgr_image_pull_seconds': ('histogram', 'Time taken to pull a utility image which was not present.'),
+    'prodmgr_catalog_parsed_bytes_total': ('counter', 'Number of bytes of product catalog parsed.'),
+}
+HISTOGRAM_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+_SAMPLE_RE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})? (?P<value>\S+)$')
+_LABEL_RE = re.compile(r'(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)="(?P<value>(?:[^"\\]|\\.)*)"')
+
+
+def _escape(value):
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _unescape(value):
+    """Reverse _escape."""
+    return re.sub(r'\\(.)', lambda match: '\n' if match.group(1) == 'n' else match.group(1), value)
+
+
+def _format_value(value):
+    """Format a sample value, without a fractional part if it is whole."""
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _family_name(sample_name):
+    """Get the name of the metric family a sample belongs to."""
+    for suffix in ('_bucket', '_sum', '_count'):
+        family = sample_name[:-len(suffix)]
+        if sample_name.endswith(suffix) and METRIC_FAMILIES.get(family, ('',))[0] == 'histogram':
+            return family
+    return sample_name
+
+
+class Metrics:
+    """Counters and histograms recorded during a prodmgr run.
+
+    Every sample, including histogram buckets, sums and counts, only ever
+    increases, so the samples of a run can be added to those in the
+    textfile.
+    """
+
+    def __init__(self):
+        self.samples = {}
+        self.labels = {}
+        # Samples may be recorded from the threads of a multi-target run.
+        self._lock = threading.Lock()
+
+    def set_labels(self, **labels):
+        """Set the labels applied to all samples recorded from now on."""
+        self.labels = labels
+
+    def _add(self, sample_name, labels, amount):
+        key = (sample_name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+    def inc(self, name, amount=1, **labels):
+        """Increment a counter.
+
+        Args:
+            name (str): The name of the counter.
+            amount (float): The amount to increment it by.
+            **labels: Labels in addition to those set by set_labels.
+        """
+        self._add(name, dict(self.labels, **labels), amount)
+
+    def observe(self, name, value, **labels):
+        """Record an observation in a histogram.
+
+        Args:
+            name (str): The name of the histogram.
+            value (float): The observed value.
+            **labels: Labels in addition to those set by set_labels.
+        """
+        labels = dict(self.labels, **labels)
+        for bucket in HISTOGRAM_BUCKETS:
+            self._add(f'{name}_bucket', dict(labels, le=str(bucket)), 1 if value <= bucket else 0)
+        self._add(f'{name}_bucket', dict(labels, le='+Inf'), 1)
+        self._add(f'{name}_sum', labels, value)
+        self._add(f'{name}_count', labels, 1)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the time taken by the body of a with statement in a histogram."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - start, **labels)
+
+    def write_textfile(self, path):
+        """Add the samples of this run to the samples in a textfile.
+
+        Args:
+            path (str): The path of the textfile.
+
+        Raises:
+            OSError: if the file could not be read or written.
+        """
+        with open(f'{path}.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            samples = read_textfile(path)
+            with self._lock:
+                run_samples = list(self.samples.items())
+            for key, value in run_samples:
+                samples[key] = samples.get(key, 0) + value
+
+            f = NamedTemporaryFile('w', dir=os.path.dirname(os.path.abspath(path)),
+                                   prefix='.prodmgr-metrics-', delete=False)
+            try:
+                with f:
+                    f.write(format_samples(samples))
+                os.chmod(f.name, 0o644)
+                os.replace(f.name, path)
+            except BaseException:
+                os.remove(f.name)
+                raise
+
+
+def read_textfile(path):
+    """Read the samples in a textfile written by prodmgr.
+
+    Lines which cannot be parsed are ignored, so a damaged file is replaced
+    rather than preventing new samples from being written.
+
+    Args:
+        path (str): The path of the textfile.
+
+    Returns:
+        dict: (sample name, sorted tuple of label pairs) to sample value.
+    """
+    samples = {}
+    if not os.path.exists(path):
+        return samples
+    with open(path) as f:
+        for line in f:
+            match = _SAMPLE_RE.match(line.strip())
+            if not match:
+                continue
+            labels = tuple(sorted(
+                (label.group('name'), _unescape(label.group('value')))
+                for label in _LABEL_RE.finditer(match.group('labels') or '')
+            ))
+            try:
+                samples[(match.group('name'), labels)] = float(match.group('value'))
+            except ValueError:
+                continue
+    return samples
+
+
+def format_samples(samples):
+    """Format samples in the Prometheus text exposition format.
+
+    Args:
+        samples (dict): (sample name, tuple of label pairs) to sample value.
+
+    Returns:
+        str: The formatted samples, grouped by metric family.
+    """
+    def sort_key(key):
+        sample_name, labels = key
+        bucket = dict(labels).get('le')
+        # Sort histogram buckets numerically, with +Inf last.
+        return (_family_name(sample_name), [label for label in labels if label[0] != 'le'],
+                sample_name, float(bucket) if bucket else 0)
+
+    lines = []
+    family = None
+    for key in sorted(samples, key=sort_key):
+        sample_name, labels = key
+        if _family_name(sample_name) != family:
+            family = _family_name(sample_name)
+            if family in METRIC_FAMILIES:
+                metric_type, help_text = METRIC_FAMILIES[family]
+                lines.append(f'# HELP {family} {help_text}')
+                lines.append(f'# TYPE {family} {metric_type}')
+        # The le label of a bucket goes last, as in other exporters.
+        ordered_labels = sorted(labels, key=lambda label: label[0] == 'le')
+        label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in ordered_labels)
+        lines.append(f'{sample_name}{{{label_text}}} {_format_value(samples[key])}')
+    return '\n'.join(lines) + '\n'
+
+
+METRICS = Metrics()
@@ -0,0 +1,278 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Compact in-memory representation of the product catalog.
+
+The data returned by read_catalog is a tree of dicts and lists in which every
+key, image name and version is a separate object. The classes here hold the
+same component information in slotted objects, with the strings that repeat
+across product versions (component kinds, image path prefixes and base
+names, versions) interned so that each is stored once.
+
+Only component_versions is modelled; other sections of a product version,
+such as configuration and recipes, are not kept. Malformed entries, such as a
+product whose data is not a mapping of versions, are left out, so that they
+do not prevent the rest of the catalog from being used.
+"""
+
+import sys
+
+from prodmgr.errors import ProdmgrError
+
+
+def _intern(value):
+    """Intern value as a string, or return None if it is None."""
+    if value is None:
+        return None
+    return sys.intern(str(value))
+
+
+class ComponentEntry:
+    """A single component of a product version, e.g. a Docker image.
+
+    The name is split into its path prefix and base name, because the same
+    prefixes (e.g. "cray") and base names (e.g. "cray-sat") recur in every
+    version of a product.
+    """
+    __slots__ = ('kind', 'prefix', 'basename', 'version')
+
+    def __init__(self, kind, name, version=None):
+        """Create a new ComponentEntry.
+
+        Args:
+            kind (str): The kind of component, e.g. 'docker' or 'helm'.
+            name (str): The name of the component, e.g. 'cray/cray-sat'.
+            version (str): The version of the component, if it has one.
+        """
+        prefix, _, basename = str(name).rpartition('/')
+        self.kind = _intern(kind)
+        self.prefix = _intern(prefix)
+        self.basename = _intern(basename)
+        self.version = _intern(version)
+
+    @classmethod
+    def from_catalog_entry(cls, kind, entry):
+        """Create a ComponentEntry from an entry in the product catalog.
+
+        Args:
+            kind (str): The kind of component.
+            entry (dict or str): A dict with 'name' and optionally 'version'
+                keys, or a plain string such as a manifest path.
+
+        Returns:
+            ComponentEntry: The new entry.
+        """
+        if isinstance(entry, dict):
+            return cls(kind, entry.get('name') or '', entry.get('version'))
+        return cls(kind, entry)
+
+    @property
+    def name(self):
+        """str: The full name of the component."""
+        if self.prefix:
+            return f'{self.prefix}/{self.basename}'
+        return self.basename
+
+    def __repr__(self):
+        return f'ComponentEntry({self.kind!r}, {self.name!r}, {self.version!r})'
+
+
+class ProductVersion:
+    """The components of a single version of a product."""
+    __slots__ = ('product', 'version', 'components', 'active')
+
+    def __init__(self, product, version, components, active=False):
+        """Create a new ProductVersion.
+
+        Args:
+            product (str): The name of the product.
+            version (str): The version of the product.
+            components (tuple of ComponentEntry): The components.
+            active (bool): Whether the version is marked active in the catalog.
+        """
+        self.product = _intern(product)
+        self.version = _intern(version)
+        self.components = tuple(components)
+        self.active = active
+
+    @classmethod
+    def from_catalog_data(cls, product, version, data):
+        """Create a ProductVersion from a product version in the product catalog.
+
+        Args:
+            product (str): The name of the product.
+            version (str): The version of the product.
+            data (dict): The data for the version, as returned by read_catalog.
+
+        Returns:
+            ProductVersion: The new product version, without components if
+                data or its component_versions is not a dict.
+        """
+        data = data if isinstance(data, dict) else {}
+        component_versions = data.get('component_versions')
+        if not isinstance(component_versions, dict):
+            component_versions = {}
+        return cls(product, version, (
+            ComponentEntry.from_catalog_entry(kind, entry)
+            for kind, entries in component_versions.items()
+            if isinstance(entries, list)
+            for entry in entries
+        ), active=bool(data.get('active')))
+
+    def find_components(self, kind, name, base_name_match=True):
+        """Find the components of the given kind with the given name.
+
+        Args:
+            kind (str): The kind of component to find, e.g. 'docker'.
+            name (str): The name to match.
+            base_name_match (bool): If True, match name against the base name
+                of each component only, otherwise against its full name.
+
+        Returns:
+            list of ComponentEntry: The matching components.
+        """
+        if base_name_match:
+            return [component for component in self.components
+                    if component.kind == kind and component.basename == name]
+        return [component for component in self.components
+                if component.kind == kind and component.name == name]
+
+    def __repr__(self):
+        return f'ProductVersion({self.product!r}, {self.version!r}, <{len(self.components)} components>)'
+
+
+class Catalog:
+    """The product versions in the product catalog, by product and version."""
+    __slots__ = ('products',)
+
+    def __init__(self, products):
+        """Create a new Catalog.
+
+        Args:
+            products (dict): Product names to dicts of version strings to
+                ProductVersion objects.
+        """
+        self.products = products
+
+    @classmethod
+    def from_catalog_data(cls, installed_products):
+        """Create a Catalog from product catalog data.
+
+        Args:
+            installed_products (dict): The product catalog data, as returned by
+                read_catalog.
+
+        Returns:
+            Catalog: The new catalog, without the products whose data is not
+                a dict of versions.
+        """
+        products = {}
+        for product, versions in installed_products.items():
+            if not isinstance(versions, dict):
+                continue
+            product = _intern(product)
+            products[product] = {
+                _intern(version): ProductVersion.from_catalog_data(product, version, data)
+                for version, data in versions.items()
+            }
+        return cls(products)
+
+    def get(self, product, version):
+        """Get a product version.
+
+        Args:
+            product (str): The name of the product.
+            version (str): The version of the product.
+
+        Returns:
+            ProductVersion: The product version, or None if it is not in the
+                catalog.
+        """
+        return self.products.get(product, {}).get(version)
+
+    def versions(self, product):
+        """Get the versions of a product in the catalog.
+
+        Args:
+            product (str): The name of the product.
+
+        Returns:
+            list of str: The versions of the product, in catalog order.
+        """
+        return list(self.products.get(product, {}))
+
+    def find_docker_image(self, docker_image, product, version, base_name_match=True):
+        """Find the named Docker image in a product version.
+
+        Args:
+            docker_image (str): The name of the Docker image.
+            product (str): The name of the product.
+            version (str): The version of the product.
+            base_name_match (bool): If True, docker_image must be a base name
+                and is matched against the base name of each image. If False,
+                it is matched against the full name of each image.
+
+        Returns:
+            ComponentEntry: The Docker image.
+
+        Raises:
+            ProdmgrError: if there is not exactly one matching image with a
+                name and version.
+        """
+        product_version = self.get(product, version)
+        if not product_version:
+            raise ProdmgrError(
+                f'No product information found for {product}:{version}.')
+
+        if not product_version.components:
+            raise ProdmgrError(
+                f'No component information found for {product}:{version}.')
+
+        if base_name_match and '/' in docker_image:
+            raise ProdmgrError(f'{docker_image} contains an invalid character: /. '
+                               f'For full path search, set base_name_match to False.')
+
+        docker_images = product_version.find_components('docker', docker_image, base_name_match)
+        if not docker_images:
+            raise ProdmgrError(
+                f'Image {docker_image} not found in product data for {product}:{version}'
+            )
+
+        elif len(docker_images) > 1:
+            raise ProdmgrError(
+                f'Multiple {docker_image} images found in product data for {product}:{version}'
+            )
+
+        image = docker_images[0]
+        if not image.basename:
+            raise ProdmgrError(
+                f'Unable to determine name of image {docker_image} from product data'
+            )
+
+        if not image.version:
+            raise ProdmgrError(
+                f'Unable to determine version of image {docker_image} from product data'
+            )
+
+        return image
@@ -26,51 +26,96 @@ CLI argument parser for prodmgr.
 """
 
 import argparse
+from datetime import datetime
+import sys
 
 from prodmgr.constants import (
     DEFAULT_CONTAINER_REGISTRY_HOSTNAME,
     DEFAULT_CERT_SRC_DIR,
     DEFAULT_CERT_TARGET_DIR,
+    DEFAULT_HISTORY_INDEX_FILE,
+    DEFAULT_KILL_GRACE,
     DEFAULT_PRODUCT_CATALOG_NAME,
     DEFAULT_PRODUCT_CATALOG_NAMESPACE,
     DEFAULT_KUBE_CONFIG_SRC_FILE,
-    DEFAULT_KUBE_CONFIG_TARGET_FILE
+    DEFAULT_KUBE_CONFIG_TARGET_FILE,
+    DEFAULT_PRUNE_WORKERS
 )
 
 
-def create_parser():
-    """Create an argument parser for this command.
+def _add_catalog_options(parser):
+    """Add the options which locate the product catalog to a parser.
 
-    Returns:
-        argparse.ArgumentParser: The parser.
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the options to.
     """
-
-    parser = argparse.ArgumentParser()
+    # These arguments need a default value because this script
+    # looks in the product catalog for the install utility image version
+    parser.add_argument(
+        '--product-catalog-name',
+        help='The name of the product catalog Kubernetes ConfigMap',
+        default=DEFAULT_PRODUCT_CATALOG_NAME
+    )
     parser.add_argument(
-        'action',
-        choices=['delete', 'uninstall', 'activate'],
-        help='Specify the operation to execute on a product. Note: activate is deprecated. uninstall is deprecated in favor of delete.'
+        '--product-catalog-namespace',
+        help='The namespace of the product catalog Kubernetes ConfigMap',
+        default=DEFAULT_PRODUCT_CATALOG_NAMESPACE
     )
+
+
+def _add_product_action_options(parser):
+    """Add the arguments of the actions which run a utility container.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
     parser.add_argument(
         'product',
         help='The name of the product to delete or activate.'
     )
     parser.add_argument(
         'version',
-        help='Specify the version of the product to operate on.'
+        help='Specify the version of the product to operate on. May also be a selector resolved against '
+             'the installed versions: "latest", "oldest", "<V", "<=V", ">V", ">=V" or "V.*", e.g. "2.3.*". '
+             'A range or wildcard selector picks the newest matching version.'
     )
-    # These arguments need a default value because this script
-    # looks in the product catalog for the install utility image version
+    _add_catalog_options(parser)
     parser.add_argument(
-        '--product-catalog-name',
-        help='The name of the product catalog Kubernetes ConfigMap',
-        default=DEFAULT_PRODUCT_CATALOG_NAME
+        '--catalog-file',
+        help='A file containing a saved product catalog ConfigMap, as written by "prodmgr snapshot", '
+             'to read instead of the live product catalog. With delete --dry-run, the components of '
+             'the product version are listed from the file without running the deletion utility. '
+             'Cannot be used with delete without --dry-run.',
+        default=None,
     )
+    _add_utility_options(parser)
     parser.add_argument(
-        '--product-catalog-namespace',
-        help='The namespace of the product catalog Kubernetes ConfigMap',
-        default=DEFAULT_PRODUCT_CATALOG_NAMESPACE
+        '--target',
+        action='append',
+        metavar='KUBE_CONFIG_FILE',
+        help='The kubeconfig file of a cluster to operate on. May be given more than once, '
+             'in which case the action is run on every cluster in parallel.',
+    )
+    parser.add_argument(
+        '--target-context',
+        action='append',
+        metavar='CONTEXT',
+        help='The name of a context in the --kube-config-src-file kubeconfig file to operate on. '
+             'May be given more than once, and may be combined with --target.',
+    )
+    parser.add_argument(
+        '-d', '--dry-run',
+        action='store_true',
+        help='Only prints the components that would be deleted for a product version without persisting the changes.'
     )
+
+
+def _add_utility_options(parser):
+    """Add the arguments used to run a utility container.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
     # Arguments that only apply to this script
     parser.add_argument(
         '--kube-config-src-file',
@@ -115,15 +160,266 @@ def create_parser():
         default=None,
     )
 
+    parser.add_argument(
+        '--timeout',
+        type=int,
+        default=None,
+        help='The number of seconds after which to stop the deletion/install utility container '
+             'and fail. Default: no timeout'
+    )
+    parser.add_argument(
+        '--kill-grace',
+        type=int,
+        default=DEFAULT_KILL_GRACE,
+        help='The number of seconds a timed out container is given to exit after SIGTERM '
+             f'before it is killed. Default: {DEFAULT_KILL_GRACE}'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip the operations completed by the last run of the same command, as recorded in the '
+             'journal in the log directory, if their product versions have not changed since.'
+    )
     parser.add_argument(
         '--extra-podman-config',
         help='Additional podman options when launching the deletion/install utility using podman container engine(Eg: --extra-podman-config "--mount type=bind,src=<src>,target=<target> --no-hosts --name deletion-container")',
         default=None,
     )
 
+
+def _add_prune_options(parser):
+    """Add the arguments of the prune action.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument(
+        '--keep',
+        type=int,
+        required=True,
+        help='The number of newest versions of each product to keep. Versions marked active are '
+             'never deleted, even if older.'
+    )
+    parser.add_argument(
+        '--keep-product',
+        action='append',
+        metavar='PRODUCT=N',
+        help='The number of newest versions of PRODUCT to keep, overriding --keep. May be given more than once.'
+    )
+    parser.add_argument(
+        '--product',
+        action='append',
+        help='Only prune this product. May be given more than once. Default: all products in the catalog.'
+    )
+    _add_catalog_options(parser)
+    parser.add_argument(
+        '--catalog-file',
+        help='A file containing a saved product catalog ConfigMap, as written by "prodmgr snapshot", '
+             'to plan the deletions from instead of the live product catalog. Requires --dry-run.',
+        default=None,
+    )
+    _add_utility_options(parser)
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_PRUNE_WORKERS,
+        help=f'The maximum number of product versions to delete at once. Default: {DEFAULT_PRUNE_WORKERS}'
+    )
     parser.add_argument(
         '-d', '--dry-run',
         action='store_true',
-        help='Only prints the components that would be deleted for a product version without persisting the changes.'
+        help='Only print the product versions that would be deleted, without running the deletion utility.'
+    )
+
+
+def _add_common_options(parser):
+    """Add the options accepted by every action.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the options to.
+    """
+    parser.add_argument(
+        '--metrics-file',
+        help='A Prometheus textfile, e.g. in the node-exporter textfile collector directory, to add '
+             'the metrics of this run to. The file is replaced atomically. Default: no metrics are written.',
+        default=None,
+    )
+
+
+def _add_diff_options(parser):
+    """Add the arguments of the diff action.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument(
+        'old_catalog',
+        help='A file containing a saved product catalog ConfigMap, as written by '
+             '"kubectl get configmap --output=yaml" or "--output=json".'
+    )
+    parser.add_argument(
+        'new_catalog',
+        nargs='?',
+        help='A file containing the product catalog ConfigMap to compare against. '
+             'Defaults to the live product catalog.'
+    )
+    _add_catalog_options(parser)
+
+
+def _add_snapshot_options(parser):
+    """Add the arguments of the snapshot action.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument(
+        'file',
+        help='The file to save the product catalog ConfigMap to. It is replaced if it exists.'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['json', 'yaml'],
+        default='json',
+        help='The format of the saved ConfigMap. JSON is faster to read back. Default: json'
+    )
+    _add_catalog_options(parser)
+
+
+def _history_time(value):
+    """Parse a time given as YYYY-MM-DD or "YYYY-MM-DD HH:MM:SS".
+
+    Args:
+        value (str): The time.
+
+    Returns:
+        str: The time as "YYYY-MM-DD HH:MM:SS", as stored in the history index.
+
+    Raises:
+        argparse.ArgumentTypeError: if the time is not in either form.
+    """
+    for time_format in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, time_format).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f'invalid time "{value}", expected YYYY-MM-DD or "YYYY-MM-DD HH:MM:SS"')
+
+
+def _add_history_options(parser):
+    """Add the arguments of the history action.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to add the arguments to.
+    """
+    parser.add_argument(
+        '--product',
+        help='Only show runs on this product.'
+    )
+    parser.add_argument(
+        '--version',
+        help='Only show runs on this version of a product.'
+    )
+    parser.add_argument(
+        '--action',
+        dest='filter_action',
+        choices=['delete', 'uninstall', 'activate', 'prune'],
+        help='Only show runs of this action.'
+    )
+    status_group = parser.add_mutually_exclusive_group()
+    status_group.add_argument(
+        '--failed',
+        action='store_const',
+        const=True,
+        default=None,
+        help='Only show failed runs.'
+    )
+    status_group.add_argument(
+        '--succeeded',
+        action='store_const',
+        const=False,
+        dest='failed',
+        help='Only show successful runs.'
+    )
+    parser.add_argument(
+        '--since',
+        type=_history_time,
+        help='Only show runs started at or after this time, given as YYYY-MM-DD or "YYYY-MM-DD HH:MM:SS".'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=20,
+        help='The maximum number of runs to show, most recent first. Use 0 for no limit. Default: 20'
+    )
+    parser.add_argument(
+        '--index-file',
+        default=DEFAULT_HISTORY_INDEX_FILE,
+        help=f'The history index to query. Default: {DEFAULT_HISTORY_INDEX_FILE}'
+    )
+
+
+class _ActionFirstParser(argparse.ArgumentParser):
+    """An argument parser which accepts options before the action.
+
+    Before prodmgr had subparsers, its options could be given anywhere on the
+    command line, e.g. "prodmgr --dry-run delete sat 1.0.0". The top-level
+    parser does not know the options of each action, so the action is moved
+    in front of them before the command line is parsed.
+    """
+
+    # The parsers of the actions, by name.
+    action_parsers = {}
+
+    def parse_known_args(self, args=None, namespace=None):
+        args = list(sys.argv[1:] if args is None else args)
+        for index, arg in enumerate(args):
+            if arg == '--':
+                break
+            if arg in self.action_parsers:
+                args = [arg] + args[:index] + args[index + 1:]
+                break
+        return super().parse_known_args(args, namespace)
+
+
+def create_parser():
+    """Create an argument parser for this command.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+
+    parser = _ActionFirstParser()
+    subparsers = parser.add_subparsers(
+        parser_class=argparse.ArgumentParser,
+        dest='action',
+        metavar='action',
+        help='Specify the operation to execute. '
+             'Note: activate is deprecated. uninstall is deprecated in favor of delete.'
     )
+    subparsers.required = True
+    parser.action_parsers = subparsers.choices
+
+    _add_product_action_options(subparsers.add_parser(
+        'delete', help='Delete a version of a product.'
+    ))
+    _add_product_action_options(subparsers.add_parser(
+        'uninstall', help='Deprecated alias for delete.'
+    ))
+    _add_product_action_options(subparsers.add_parser(
+        'activate', help='Deprecated. Activate a version of a product using its install utility.'
+    ))
+    _add_diff_options(subparsers.add_parser(
+        'diff', help='Show the product versions and components added or removed between two product catalogs.'
+    ))
+    _add_snapshot_options(subparsers.add_parser(
+        'snapshot', help='Save the product catalog to a file for use with --catalog-file or diff.'
+    ))
+    _add_history_options(subparsers.add_parser(
+        'history', help='Show past delete, uninstall, activate and prune runs from the history index.'
+    ))
+    _add_prune_options(subparsers.add_parser(
+        'prune', help='Delete all but the newest versions of each product.'
+    ))
+    for subparser in subparsers.choices.values():
+        _add_common_options(subparser)
     return parser
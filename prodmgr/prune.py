@@ -0,0 +1,93 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Retention-based pruning of old product versions.
+"""
+
+from collections import namedtuple
+
+from prodmgr.errors import ProdmgrError
+from prodmgr.versions import VersionIndex
+
+
+class PruneCandidate(namedtuple('PruneCandidate', ['product', 'version'])):
+    """A product version to be deleted by prune."""
+    __slots__ = ()
+
+    @property
+    def name(self):
+        """str: The product and version, as 'product:version'."""
+        return f'{self.product}:{self.version}'
+
+
+def parse_keep_overrides(overrides):
+    """Parse per-product retention counts.
+
+    Args:
+        overrides (list of str): Overrides given as 'PRODUCT=N'.
+
+    Returns:
+        dict: Product names to the number of versions to keep.
+
+    Raises:
+        ProdmgrError: if an override is not of the form 'PRODUCT=N' with a
+            non-negative N.
+    """
+    keep_by_product = {}
+    for override in overrides or []:
+        product, _, count = override.partition('=')
+        if not product or not count.isdigit():
+            raise ProdmgrError(f'Invalid --keep-product value {override}: expected PRODUCT=N')
+        keep_by_product[product] = int(count)
+    return keep_by_product
+
+
+def plan_prune(catalog, keep, keep_by_product=None, products=None):
+    """Find the product versions to delete to keep only the newest of each product.
+
+    Versions marked active in the catalog are never deleted, even if they are
+    older than the versions kept.
+
+    Args:
+        catalog (Catalog): The product catalog.
+        keep (int): The number of newest versions of each product to keep.
+        keep_by_product (dict): Product names to the number of versions to
+            keep for that product, overriding keep.
+        products (list of str): The products to prune. Defaults to all
+            products in the catalog.
+
+    Returns:
+        list of PruneCandidate: The product versions to delete, by product
+            and then oldest first.
+    """
+    keep_by_product = keep_by_product or {}
+    index = VersionIndex.from_catalog(catalog)
+    candidates = []
+    for product in sorted(products or index.versions):
+        versions = index.versions.get(product, [])
+        product_keep = keep_by_product.get(product, keep)
+        candidates.extend(PruneCandidate(product, version)
+                          for version in versions[:max(len(versions) - product_keep, 0)]
+                          if not catalog.get(product, version).active)
+    return candidates
@@ -0,0 +1,123 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Helpers for running prodmgr operations concurrently.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from prodmgr.errors import ProdmgrError
+
+TaskResult = namedtuple('TaskResult', ['item', 'value', 'error', 'duration'])
+Outcome = namedtuple('Outcome', ['status', 'details', 'output'])
+
+
+def _timed_call(func, item):
+    """Call func on item, catching any ProdmgrError it raises.
+
+    Args:
+        func (callable): The function to call.
+        item: The single argument to pass to func.
+
+    Returns:
+        TaskResult: The outcome of the call.
+    """
+    start = time.monotonic()
+    try:
+        value = func(item)
+    except ProdmgrError as err:
+        return TaskResult(item, None, err, time.monotonic() - start)
+    return TaskResult(item, value, None, time.monotonic() - start)
+
+
+def run_parallel(func, items, max_workers=None, on_interrupt=None):
+    """Call func on each of items concurrently using a pool of threads.
+
+    The work done by prodmgr is almost entirely waiting on kubectl and podman
+    subprocesses, so threads are sufficient to overlap it.
+
+    Args:
+        func (callable): A function taking a single item. A ProdmgrError raised
+            by func is recorded in the result for that item; any other
+            exception is propagated.
+        items (list): The items to operate on.
+        max_workers (int): The maximum number of items to operate on at once.
+            Defaults to one worker per item.
+        on_interrupt (callable): Called with no arguments if the calling
+            thread is interrupted while the items are run, to stop the items
+            in progress. The items not yet started are not run.
+
+    Returns:
+        list of TaskResult: The results, in the same order as items.
+
+    Raises:
+        KeyboardInterrupt: if the calling thread was interrupted. The items
+            in progress have finished when it is raised.
+    """
+    items = list(items)
+    if not items:
+        return []
+    if not max_workers:
+        max_workers = len(items)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(_timed_call, func, item) for item in items]
+        try:
+            return [future.result() for future in futures]
+        except KeyboardInterrupt:
+            # Only the calling thread is interrupted, and the executor waits
+            # for the items in progress when it shuts down.
+            for future in futures:
+                future.cancel()
+            if on_interrupt:
+                on_interrupt()
+            raise
+
+
+def format_report(results, heading):
+    """Format the outcome of an operation run on multiple items.
+
+    Args:
+        results (list of TaskResult): The results of the operation, where
+            each item has a name and each value is an Outcome.
+        heading (str): The heading of the column of item names.
+
+    Returns:
+        str: A table with one row per item.
+    """
+    rows = [(heading, 'RESULT', 'DURATION', 'DETAILS')]
+    for result in results:
+        if result.error:
+            status, details = 'failed', str(result.error)
+        else:
+            status, details = result.value.status, result.value.details
+        rows.append((result.item.name, status, f'{result.duration:.1f}s', details))
+
+    widths = [max(len(row[column]) for row in rows) for column in range(3)]
+    return '\n'.join(
+        '  '.join(value.ljust(width) for value, width in zip(row, widths)) + '  ' + row[3]
+        for row in rows
+    )
@@ -0,0 +1,121 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Resolution of the clusters targeted by a multi-target prodmgr run.
+"""
+
+from collections import namedtuple
+import os
+import re
+from subprocess import check_output, CalledProcessError, STDOUT
+
+from prodmgr.errors import ProdmgrError
+
+Target = namedtuple('Target', ['name', 'kube_config'])
+
+
+def _safe_name(name):
+    """Return name with any characters unsuitable for a file name replaced."""
+    return re.sub(r'[^\w.-]', '_', name)
+
+
+def _write_context_kube_config(context, kube_config_src_file, target_dir):
+    """Write a kubeconfig file containing only the given context.
+
+    Args:
+        context (str): The name of the context to extract.
+        kube_config_src_file (str): The kubeconfig file containing the context.
+        target_dir (str): The directory in which to write the new file.
+
+    Returns:
+        str: The path to the new kubeconfig file.
+
+    Raises:
+        ProdmgrError: if the context could not be extracted.
+    """
+    try:
+        kube_config = check_output([
+            'kubectl', 'config', 'view', '--minify', '--flatten',
+            f'--kubeconfig={kube_config_src_file}', f'--context={context}'
+        ], stderr=STDOUT)
+    except CalledProcessError as err:
+        raise ProdmgrError(f'Unable to read context {context} from {kube_config_src_file}: {err}')
+    except OSError as err:
+        raise ProdmgrError(f'Unable to run kubectl: {err}')
+
+    path = os.path.join(target_dir, f'{_safe_name(context)}.conf')
+    with open(path, 'wb') as f:
+        f.write(kube_config)
+    return path
+
+
+def resolve_targets(kube_config_files, contexts, kube_config_src_file, target_dir):
+    """Get the clusters to operate on from kubeconfig files and contexts.
+
+    Each context is written out to its own minimal kubeconfig file, so that
+    every target can be mounted into a container the same way as
+    --kube-config-src-file.
+
+    Args:
+        kube_config_files (list of str): Paths to kubeconfig files, one per
+            cluster.
+        contexts (list of str): Names of contexts in kube_config_src_file,
+            one per cluster.
+        kube_config_src_file (str): The kubeconfig file containing contexts.
+        target_dir (str): A directory in which to write the kubeconfig files
+            for contexts.
+
+    Returns:
+        list of Target: The targets, kubeconfig files first.
+
+    Raises:
+        ProdmgrError: if a kubeconfig file does not exist or a context could
+            not be read.
+    """
+    targets = []
+    for kube_config in kube_config_files or []:
+        if not os.path.isfile(kube_config):
+            raise ProdmgrError(f'Kubernetes configuration file {kube_config} does not exist')
+        targets.append(Target(kube_config, kube_config))
+    for context in contexts or []:
+        targets.append(Target(context, _write_context_kube_config(context, kube_config_src_file, target_dir)))
+
+    names = [target.name for target in targets]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ProdmgrError(f'Targets specified more than once: {", ".join(duplicates)}')
+    return targets
+
+
+def target_log_file(log_file, target):
+    """Get the log file to be used by the container run against a target.
+
+    Args:
+        log_file (str): The log file of this prodmgr run.
+        target (Target): The target being operated on.
+
+    Returns:
+        str: The path of the log file for the target.
+    """
+    return f'{log_file}-{_safe_name(target.name)}'
@@ -0,0 +1,180 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Sorting of product versions and resolution of version selectors.
+
+A version selector is one of:
+
+    latest, oldest      the newest or oldest installed version
+    <V, <=V, >V, >=V    the newest installed version in that range
+    V.*                 the newest installed version starting with V, e.g. 2.3.*
+
+Anything else is an exact version string.
+"""
+
+from bisect import bisect_left, bisect_right
+import re
+
+from prodmgr.errors import ProdmgrError
+
+_RANGE_SELECTOR_RE = re.compile(r'^(?P<operator><=|>=|<|>)\s*(?P<version>\S+)$')
+
+
+def _part_key(part):
+    """Get the sort key of one dot-separated part of a version.
+
+    Numeric parts sort numerically and before non-numeric parts.
+    """
+    if part.isdigit():
+        return 0, int(part), ''
+    return 1, 0, part
+
+
+def version_key(version):
+    """Get a key which sorts versions semantically.
+
+    The release part of the version (before any '-' or '+') is compared
+    part by part, numerically where possible. A pre-release such as
+    2.4.0-rc1 sorts before the release 2.4.0, and build metadata after '+'
+    is ignored.
+
+    Args:
+        version (str): The version.
+
+    Returns:
+        tuple: The sort key.
+    """
+    version = str(version).split('+', 1)[0]
+    release, _, prerelease = version.partition('-')
+    release_key = tuple(_part_key(part) for part in release.split('.'))
+    if prerelease:
+        return release_key, 0, tuple(_part_key(part) for part in prerelease.split('.'))
+    return release_key, 1, ()
+
+
+def is_version_selector(version):
+    """Check whether a version given on the command line is a selector rather than an exact version.
+
+    Args:
+        version (str): The version or selector.
+
+    Returns:
+        bool: True if the version is a selector.
+    """
+    return version in ('latest', 'oldest') or version.endswith('.*') or bool(_RANGE_SELECTOR_RE.match(version))
+
+
+class VersionIndex:
+    """The versions of each product in the product catalog, sorted semantically."""
+
+    def __init__(self, versions_by_product):
+        """Create a new VersionIndex.
+
+        Args:
+            versions_by_product (dict): Product names to lists of version
+                strings in any order.
+        """
+        self.versions = {}
+        self.keys = {}
+        for product, versions in versions_by_product.items():
+            keyed_versions = sorted((version_key(version), version) for version in versions)
+            self.keys[product] = [key for key, _ in keyed_versions]
+            self.versions[product] = [version for _, version in keyed_versions]
+
+    @classmethod
+    def from_catalog(cls, catalog):
+        """Create a VersionIndex of the versions in a product catalog.
+
+        Args:
+            catalog (Catalog): The product catalog.
+
+        Returns:
+            VersionIndex: The new index.
+        """
+        return cls({product: catalog.versions(product) for product in catalog.products})
+
+    def sorted_versions(self, product):
+        """Get the versions of a product, oldest first.
+
+        Args:
+            product (str): The name of the product.
+
+        Returns:
+            list of str: The versions.
+        """
+        return list(self.versions.get(product, []))
+
+    def _range(self, product, selector):
+        """Get the slice of the sorted versions of product matched by a selector.
+
+        Returns:
+            tuple: The start and end indices of the slice.
+        """
+        keys = self.keys.get(product, [])
+        if selector in ('latest', 'oldest'):
+            return 0, len(keys)
+
+        if selector.endswith('.*'):
+            prefix = tuple(_part_key(part) for part in selector[:-2].split('.'))
+            if prefix[-1][0] != 0:
+                raise ProdmgrError(f'Invalid version selector {selector}: the part before .* must be numeric')
+            # All versions starting with the prefix sort between the prefix
+            # itself and the prefix with its last part incremented.
+            upper = prefix[:-1] + ((0, prefix[-1][1] + 1, ''),)
+            return bisect_left(keys, (prefix,)), bisect_left(keys, (upper,))
+
+        match = _RANGE_SELECTOR_RE.match(selector)
+        operator, bound = match.group('operator'), version_key(match.group('version'))
+        if operator == '<':
+            return 0, bisect_left(keys, bound)
+        if operator == '<=':
+            return 0, bisect_right(keys, bound)
+        if operator == '>':
+            return bisect_right(keys, bound), len(keys)
+        return bisect_left(keys, bound), len(keys)
+
+    def resolve(self, product, selector):
+        """Resolve a version or version selector to an installed version of a product.
+
+        Args:
+            product (str): The name of the product.
+            selector (str): An exact version or a version selector.
+
+        Returns:
+            str: The installed version. For a selector matching more than
+                one version, the newest of them, except for 'oldest'.
+
+        Raises:
+            ProdmgrError: if no installed version matches.
+        """
+        versions = self.versions.get(product, [])
+        if not is_version_selector(selector):
+            if selector not in versions:
+                raise ProdmgrError(f'No product information found for {product}:{selector}.')
+            return selector
+
+        start, end = self._range(product, selector)
+        if start >= end:
+            raise ProdmgrError(f'No installed version of {product} matches {selector}')
+        return versions[start] if selector == 'oldest' else versions[end - 1]
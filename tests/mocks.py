@@ -22,9 +22,15 @@
 # OTHER DEALINGS IN THE SOFTWARE.
 #
 """
-Fake data for unit tests for prodmgr.
+Fake data and fixtures for unit tests for prodmgr.
 """
 
+import json
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
 from yaml import safe_dump
 
 SAT_VERSIONS = {
@@ -45,3 +51,49 @@ MOCK_PRODUCT_CATALOG_DATA = {
 MOCK_CONFIGMAP_OUTPUT = safe_dump({
     'data': MOCK_PRODUCT_CATALOG_DATA
 })
+
+PRUNE_CATALOG_DATA = {
+    'sat': {'2.9.0': {}, '2.10.0': {}, '2.10.1-rc.1': {}, '2.10.1': {}},
+    'cos': {'2.4.1': {'active': True}, '2.5.0': {}, '2.6.0': {}},
+    'slingshot': {'1.0.0': {}},
+}
+
+FAKE_BIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_bin')
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeClusterTestCase(unittest.TestCase):
+    """Base class for tests which use the fake kubectl and podman."""
+
+    def setUp(self):
+        """Put the fake binaries on the PATH and create a working directory."""
+        self.tmp_dir = TemporaryDirectory()
+        self.podman_log = os.path.join(self.tmp_dir.name, 'podman.log')
+        patch.dict(os.environ, {
+            'PATH': FAKE_BIN_DIR + os.pathsep + os.environ['PATH'],
+            'FAKE_PODMAN_LOG': self.podman_log
+        }).start()
+        patch('prodmgr.main.logfile', os.path.join(self.tmp_dir.name, 'delete-sat-1.0.0')).start()
+
+    def tearDown(self):
+        """Stop patches and remove the working directory."""
+        patch.stopall()
+        self.tmp_dir.cleanup()
+
+    def write_kube_config(self, file_name, contexts):
+        """Write a fake kubeconfig file whose current context is the first of contexts."""
+        path = os.path.join(self.tmp_dir.name, file_name)
+        with open(path, 'w') as f:
+            json.dump({'current-context': contexts[0]['name'], 'contexts': contexts}, f)
+        return path
+
+    def podman_commands(self):
+        """Get the podman command lines run so far."""
+        if not os.path.exists(self.podman_log):
+            return []
+        with open(self.podman_log) as f:
+            return [json.loads(line) for line in f]
+
+    def podman_runs(self):
+        """Get the podman run command lines run so far."""
+        return [command for command in self.podman_commands() if command[0] == 'run']
@@ -0,0 +1,127 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for prodmgr.diff.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from yaml import safe_dump, safe_load
+
+from tests.mocks import MOCK_PRODUCT_CATALOG_DATA, SAT_VERSIONS
+
+from prodmgr.diff import CatalogChange, diff_catalogs, format_changes
+from prodmgr.errors import ProdmgrError
+
+COS_VERSIONS = {
+    '2.5.101': {
+        'component_versions': {
+            'docker': [{'name': 'cray/cray-cps-cm', 'version': '2.8.6'}],
+            'manifests': ['config-data/argo/loftsman/cos/2.5.101/manifests/cos-services.yaml']
+        },
+        'recipes': {'cray-shasta-compute': {'id': 'a519dc00'}}
+    }
+}
+
+
+class TestDiffCatalogs(unittest.TestCase):
+    """Test the diff_catalogs function."""
+
+    def test_identical_catalogs(self):
+        """Test that identical products are skipped without being parsed."""
+        with patch('prodmgr.diff.safe_load') as mock_safe_load:
+            changes = diff_catalogs(MOCK_PRODUCT_CATALOG_DATA, dict(MOCK_PRODUCT_CATALOG_DATA))
+        self.assertEqual([], changes)
+        mock_safe_load.assert_not_called()
+
+    def test_product_added_and_removed(self):
+        """Test adding one product and removing another."""
+        changes = diff_catalogs(MOCK_PRODUCT_CATALOG_DATA, {'cos': safe_dump(COS_VERSIONS)})
+        self.assertEqual([
+            CatalogChange('+', 'cos', '2.5.101', None, None),
+            CatalogChange('-', 'sat', '1.0.0', None, None)
+        ], changes)
+
+    def test_version_components_changed(self):
+        """Test reporting only the changed entries of a product version."""
+        new_versions = safe_load(MOCK_PRODUCT_CATALOG_DATA['sat'])
+        new_versions['1.0.0']['component_versions']['docker'][0]['version'] = '1.0.1'
+        new_versions['1.0.0']['component_versions']['helm'] = [{'name': 'sat', 'version': '1.0.0'}]
+        new_versions['1.0.0']['active'] = True
+        new_versions['2.0.0'] = SAT_VERSIONS['1.0.0']
+
+        changes = diff_catalogs(MOCK_PRODUCT_CATALOG_DATA, {'sat': safe_dump(new_versions)})
+
+        self.assertEqual([
+            CatalogChange('~', 'sat', '1.0.0', 'active', 'None -> True'),
+            CatalogChange('-', 'sat', '1.0.0', 'docker', 'cray/cray-sat:1.0.0'),
+            CatalogChange('+', 'sat', '1.0.0', 'docker', 'cray/cray-sat:1.0.1'),
+            CatalogChange('+', 'sat', '1.0.0', 'helm', 'sat:1.0.0'),
+            CatalogChange('+', 'sat', '2.0.0', None, None)
+        ], changes)
+
+    def test_reordered_entries(self):
+        """Test that reordering the entries of a component list is not a change."""
+        new_versions = safe_load(MOCK_PRODUCT_CATALOG_DATA['sat'])
+        new_versions['1.0.0']['component_versions']['docker'].reverse()
+        self.assertEqual([], diff_catalogs(MOCK_PRODUCT_CATALOG_DATA, {'sat': safe_dump(new_versions)}))
+
+    def test_other_sections_changed(self):
+        """Test changes to lists of strings and to mappings outside component_versions."""
+        new_versions = safe_load(safe_dump(COS_VERSIONS))
+        new_versions['2.5.101']['component_versions']['manifests'] = []
+        new_versions['2.5.101']['recipes'] = {'cray-shasta-compute': {'id': 'b7c1'}, 'cray-shasta-uan': {}}
+
+        changes = diff_catalogs({'cos': safe_dump(COS_VERSIONS)}, {'cos': safe_dump(new_versions)})
+
+        self.assertEqual([
+            CatalogChange('-', 'cos', '2.5.101', 'manifests',
+                          'config-data/argo/loftsman/cos/2.5.101/manifests/cos-services.yaml'),
+            CatalogChange('~', 'cos', '2.5.101', 'recipes', 'cray-shasta-compute'),
+            CatalogChange('+', 'cos', '2.5.101', 'recipes', 'cray-shasta-uan'),
+        ], changes)
+
+    def test_invalid_yaml(self):
+        """Test a changed product entry containing invalid YAML."""
+        with self.assertRaisesRegex(ProdmgrError, 'The entry for sat in saved.yaml contained invalid YAML'):
+            diff_catalogs({'sat': '\t'}, MOCK_PRODUCT_CATALOG_DATA, old_source='saved.yaml')
+
+
+class TestFormatChanges(unittest.TestCase):
+    """Test the format_changes function."""
+
+    def test_format_changes(self):
+        """Test formatting version and entry changes."""
+        self.assertEqual(
+            '+ sat 2.0.0\n- sat 1.0.0 docker cray/cray-sat:1.0.0',
+            format_changes([
+                CatalogChange('+', 'sat', '2.0.0', None, None),
+                CatalogChange('-', 'sat', '1.0.0', 'docker', 'cray/cray-sat:1.0.0')
+            ])
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
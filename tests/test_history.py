@@ -0,0 +1,156 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for prodmgr.history.
+"""
+
+from datetime import datetime
+from io import StringIO
+import json
+import os
+import sqlite3
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from tests.mocks import MOCK_PRODUCT_CATALOG_DATA
+
+from prodmgr.history import format_runs, query_runs, record_run
+from prodmgr.main import main
+from prodmgr.parser import create_parser
+
+
+class TestHistory(unittest.TestCase):
+    """Test recording and querying runs in the history index."""
+
+    def setUp(self):
+        """Create a history index with a few runs."""
+        self.tmp_dir = TemporaryDirectory()
+        self.index_file = os.path.join(self.tmp_dir.name, 'history.db')
+        for day, action, product, version, exit_status in [
+            (1, 'delete', 'sat', '2.1.0', 0),
+            (2, 'delete', 'cos', '2.5.101', 1),
+            (3, 'activate', 'sat', '2.2.0', 0),
+            (4, 'delete', 'sat', '2.2.0', 1),
+        ]:
+            record_run(self.index_file, datetime(2026, 3, day, 12, 0, 0), action, product, version,
+                       'product-deletion-utility:1.0.2', 12.5, exit_status,
+                       f'/var/log/{action}-{product}-{version}-2026030{day}-120000')
+
+    def tearDown(self):
+        """Remove the history index."""
+        self.tmp_dir.cleanup()
+
+    def test_query_all(self):
+        """Test that runs are returned most recent first."""
+        runs = query_runs(self.index_file)
+        self.assertEqual(['2.2.0', '2.2.0', '2.5.101', '2.1.0'], [run['version'] for run in runs])
+        self.assertEqual('2026-03-04 12:00:00', runs[0]['started'])
+
+    def test_query_product(self):
+        """Test finding every run that touched a product."""
+        runs = query_runs(self.index_file, product='sat')
+        self.assertEqual([('delete', '2.2.0'), ('activate', '2.2.0'), ('delete', '2.1.0')],
+                         [(run['action'], run['version']) for run in runs])
+
+    def test_query_last_failure(self):
+        """Test finding the last failed run."""
+        runs = query_runs(self.index_file, failed=True, limit=1)
+        self.assertEqual(1, len(runs))
+        self.assertEqual('/var/log/delete-sat-2.2.0-20260304-120000', runs[0]['log_file'])
+
+    def test_query_succeeded_since(self):
+        """Test combining the status and start time filters."""
+        runs = query_runs(self.index_file, failed=False, since='2026-03-02')
+        self.assertEqual([('activate', 'sat')], [(run['action'], run['product']) for run in runs])
+
+    def test_query_action_and_version(self):
+        """Test filtering on the action and version."""
+        runs = query_runs(self.index_file, action='delete', version='2.2.0')
+        self.assertEqual(1, len(runs))
+
+    def test_query_does_not_change_index(self):
+        """Test that querying does not create the schema, so a read-only index can be queried."""
+        with sqlite3.connect(self.index_file) as connection:
+            connection.execute('DROP INDEX runs_product')
+        connection.close()
+        self.assertEqual(4, len(query_runs(self.index_file)))
+        with sqlite3.connect(self.index_file) as connection:
+            indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        connection.close()
+        self.assertNotIn('runs_product', indexes)
+
+    def test_format_runs(self):
+        """Test formatting runs as a table."""
+        table = format_runs(query_runs(self.index_file, product='cos'))
+        header, row = table.splitlines()
+        self.assertTrue(header.startswith('STARTED'))
+        self.assertRegex(row, r'^2026-03-02 12:00:00\s+delete\s+cos\s+2.5.101\s+failed \(1\)\s+12.5s')
+
+
+class TestRecordDryRun(unittest.TestCase):
+    """Test that dry runs are not recorded in the history index."""
+
+    def setUp(self):
+        """Save a product catalog to a file."""
+        self.tmp_dir = TemporaryDirectory()
+        self.catalog_file = os.path.join(self.tmp_dir.name, 'catalog.json')
+        with open(self.catalog_file, 'w') as f:
+            json.dump({'data': MOCK_PRODUCT_CATALOG_DATA}, f)
+        patch('prodmgr.main._setup_logging').start()
+        patch('prodmgr.main.logfile', os.path.join(self.tmp_dir.name, 'delete-sat-1.0.0')).start()
+
+    def tearDown(self):
+        """Stop patches and remove the catalog."""
+        patch.stopall()
+        self.tmp_dir.cleanup()
+
+    def test_delete_dry_run(self):
+        """Test that a dry run of delete is not recorded."""
+        with patch('sys.argv', ['prodmgr', 'delete', 'sat', '1.0.0', '--dry-run',
+                                '--catalog-file', self.catalog_file]):
+            with self.assertLogs('prodmgr', level='INFO'):
+                main()
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir.name, 'history.db')))
+
+
+class TestHistoryOptions(unittest.TestCase):
+    """Test parsing the options of the history action."""
+
+    def test_since(self):
+        """Test that --since is normalized to the form stored in the history index."""
+        parser = create_parser()
+        self.assertEqual('2026-03-02 00:00:00', parser.parse_args(['history', '--since', '2026-3-2']).since)
+        self.assertEqual('2026-03-02 08:30:00',
+                         parser.parse_args(['history', '--since', '2026-03-02 08:30:00']).since)
+
+    def test_since_invalid(self):
+        """Test that a --since which is not a time is rejected."""
+        with patch('sys.stderr', new_callable=StringIO) as stderr, self.assertRaises(SystemExit):
+            create_parser().parse_args(['history', '--since', 'yesterday'])
+        self.assertIn('invalid time "yesterday"', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
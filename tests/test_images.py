@@ -0,0 +1,84 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for checking for and pulling utility images.
+"""
+
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from tests.mocks import FakeClusterTestCase
+
+from prodmgr.errors import ProdmgrError
+from prodmgr.images import image_exists, prepull_images, pull_image
+
+
+class TestPrepullImages(FakeClusterTestCase):
+    """Test the image_exists, pull_image and prepull_images functions."""
+
+    def pulls(self):
+        """Get the images pulled so far."""
+        return [command[-1] for command in self.podman_commands() if command[0] == 'pull']
+
+    def test_pull_image(self):
+        """Test that a pulled image exists."""
+        self.assertFalse(image_exists('registry.local/cray/sat:1.0.0'))
+        pull_image('registry.local/cray/sat:1.0.0')
+        self.assertTrue(image_exists('registry.local/cray/sat:1.0.0'))
+
+    def test_pull_image_failure(self):
+        """Test that a failed pull raises ProdmgrError with the output of podman."""
+        patch.dict(os.environ, {'FAKE_PODMAN_PULL_FAILURES': 'registry.local/cray/sat:1.0.0'}).start()
+        with self.assertRaisesRegex(ProdmgrError, 'Unable to pull registry.local/cray/sat:1.0.0: .*manifest unknown'):
+            pull_image('registry.local/cray/sat:1.0.0')
+
+    def test_prepull_missing_images(self):
+        """Test that only missing images are pulled, once each and concurrently."""
+        patch.dict(os.environ, {'FAKE_PODMAN_PULL_SECONDS': '0.5'}).start()
+        pull_image('registry.local/cray/present:1.0.0')
+
+        start = time.monotonic()
+        results = prepull_images(['registry.local/cray/a:1.0.0', 'registry.local/cray/present:1.0.0',
+                                  'registry.local/cray/b:1.0.0', 'registry.local/cray/a:1.0.0'])
+        self.assertLess(time.monotonic() - start, 1)
+
+        self.assertEqual(
+            [('registry.local/cray/a:1.0.0', True), ('registry.local/cray/b:1.0.0', True),
+             ('registry.local/cray/present:1.0.0', False)],
+            [(result.item, result.value) for result in results]
+        )
+        self.assertEqual(['registry.local/cray/a:1.0.0', 'registry.local/cray/b:1.0.0'], sorted(self.pulls()[1:]))
+
+    def test_prepull_failure(self):
+        """Test that a failed pull is recorded in its result."""
+        patch.dict(os.environ, {'FAKE_PODMAN_PULL_FAILURES': 'registry.local/cray/a:1.0.0'}).start()
+        results = prepull_images(['registry.local/cray/a:1.0.0', 'registry.local/cray/b:1.0.0'])
+        self.assertIsInstance(results[0].error, ProdmgrError)
+        self.assertTrue(results[1].value)
+
+
+if __name__ == '__main__':
+    unittest.main()
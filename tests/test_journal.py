@@ -0,0 +1,263 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for the operation journal.
+"""
+
+import json
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from yaml import safe_dump
+
+from tests.mocks import FakeClusterTestCase, PRUNE_CATALOG_DATA, SAT_VERSIONS
+
+from prodmgr.errors import ProdmgrError
+from prodmgr.journal import find_resumable, Journal
+from prodmgr.main import run_product_action, run_prune
+from prodmgr.parser import create_parser
+
+
+class TestJournal(unittest.TestCase):
+    """Test the Journal class and find_resumable function."""
+
+    def setUp(self):
+        """Create a directory for the journal."""
+        self.tmp_dir = TemporaryDirectory()
+        self.journal_file = os.path.join(self.tmp_dir.name, 'journal.jsonl')
+
+    def tearDown(self):
+        """Remove the journal."""
+        self.tmp_dir.cleanup()
+
+    def interrupted_run(self, command='prune'):
+        """Record a run which completed one operation and was interrupted during another."""
+        journal = Journal(self.journal_file, command)
+        journal.start_run()
+        journal.start_op('delete sat:1.0.0')
+        journal.end_op('delete sat:1.0.0', 'succeeded', 'absent')
+        journal.start_op('delete sat:1.1.0')
+        return journal
+
+    def test_events(self):
+        """Test that each event is appended as a line of JSON."""
+        journal = self.interrupted_run()
+        journal.end_op('delete sat:1.1.0', 'failed', 'sha256:1234')
+        journal.end_run('failed')
+
+        with open(self.journal_file) as f:
+            events = [json.loads(line) for line in f]
+        self.assertEqual(['run-start', 'op-start', 'op-end', 'op-start', 'op-end', 'run-end'],
+                         [event['event'] for event in events])
+        self.assertEqual({journal.run}, {event['run'] for event in events})
+        self.assertEqual('sha256:1234', events[4]['state'])
+
+    def test_find_resumable(self):
+        """Test finding the operations completed by an interrupted run."""
+        journal = self.interrupted_run()
+        resume_point = find_resumable(self.journal_file, 'prune')
+        self.assertEqual(journal.run, resume_point.run)
+        self.assertEqual({'delete sat:1.0.0': 'absent'}, resume_point.completed)
+
+    def test_find_resumable_partial_line(self):
+        """Test that a partially written last line is ignored."""
+        self.interrupted_run()
+        with open(self.journal_file, 'a') as f:
+            f.write('{"event": "op-e')
+        self.assertEqual({'delete sat:1.0.0': 'absent'}, find_resumable(self.journal_file, 'prune').completed)
+
+    def test_find_resumable_other_command(self):
+        """Test that runs of other commands are not resumed."""
+        self.interrupted_run('delete sat 1.0.0')
+        self.assertIsNone(find_resumable(self.journal_file, 'prune'))
+
+    def test_find_resumable_succeeded(self):
+        """Test that the operations completed by a run which succeeded are found too."""
+        journal = self.interrupted_run()
+        journal.end_run('succeeded')
+        resume_point = find_resumable(self.journal_file, 'prune')
+        self.assertEqual(journal.run, resume_point.run)
+        self.assertEqual({'delete sat:1.0.0': 'absent'}, resume_point.completed)
+
+    def test_find_resumable_no_journal(self):
+        """Test finding a run to resume when there is no journal."""
+        self.assertIsNone(find_resumable(self.journal_file, 'prune'))
+
+    def test_is_completed(self):
+        """Test that operations are only completed if their product version has not changed since."""
+        self.interrupted_run()
+        journal = Journal(self.journal_file, 'prune', find_resumable(self.journal_file, 'prune'))
+        self.assertTrue(journal.is_completed('delete sat:1.0.0', 'absent'))
+        self.assertFalse(journal.is_completed('delete sat:1.0.0', 'sha256:1234'))
+        self.assertFalse(journal.is_completed('delete sat:1.0.0', None))
+        self.assertFalse(journal.is_completed('delete sat:1.1.0', 'absent'))
+
+    def test_unwritable_journal(self):
+        """Test that a journal which cannot be written raises ProdmgrError."""
+        journal = Journal(os.path.join(self.tmp_dir.name, 'missing', 'journal.jsonl'), 'prune')
+        with self.assertRaisesRegex(ProdmgrError, 'Unable to write journal'):
+            journal.start_run()
+
+
+class TestResumePrune(FakeClusterTestCase):
+    """Test resuming an interrupted prune."""
+
+    def setUp(self):
+        """Point kubectl at a fake cluster with several versions of each product."""
+        super().setUp()
+        self.journal_file = os.path.join(self.tmp_dir.name, 'journal.jsonl')
+        self.write_cluster(PRUNE_CATALOG_DATA)
+
+    def write_cluster(self, catalog_data):
+        """Write the kubeconfig of the fake cluster."""
+        self.kube_config = self.write_kube_config('prune.conf', [{
+            'name': 'alpha', 'catalog': {
+                product: safe_dump(versions) for product, versions in catalog_data.items()
+            }
+        }])
+        patch.dict(os.environ, {'KUBECONFIG': self.kube_config}).start()
+
+    def prune(self, resume):
+        """Run prune, keeping the newest version of each product."""
+        args, remaining_args = create_parser().parse_known_args(
+            ['prune', '--keep', '1', '--kube-config-src-file', self.kube_config]
+        )
+        journal = Journal(self.journal_file, 'prune', find_resumable(self.journal_file, 'prune') if resume else None)
+        journal.start_run()
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            run_prune(args, remaining_args, journal)
+        return logs
+
+    def interrupt_last_run(self):
+        """Make the journal and catalog look as if the last run was interrupted while deleting sat:2.10.0."""
+        with open(self.journal_file) as f:
+            events = [json.loads(line) for line in f]
+        events = [event for event in events
+                  if event['event'] != 'run-end' and
+                  not (event['event'] == 'op-end' and event['op'] == 'delete sat:2.10.0')]
+        with open(self.journal_file, 'w') as f:
+            f.write(''.join(json.dumps(event) + '\n' for event in events))
+        self.write_cluster({'sat': {'2.10.0': {}, '2.10.1': {}}, 'cos': {'2.4.1': {'active': True}, '2.6.0': {}},
+                            'slingshot': {'1.0.0': {}}})
+
+    def deleted_versions(self):
+        """Get the product versions deleted by podman so far, in order."""
+        return [':'.join(run[run.index('delete') + 1:run.index('delete') + 3]) for run in self.podman_runs()]
+
+    def test_resume(self):
+        """Test that only the operations not completed by the interrupted run are run."""
+        self.prune(resume=False)
+        self.interrupt_last_run()
+        os.remove(self.podman_log)
+
+        self.prune(resume=True)
+        self.assertEqual(['sat:2.10.0'], self.deleted_versions())
+
+    def test_resume_twice(self):
+        """Test that operations skipped by a resumed run are skipped again if it is resumed."""
+        self.prune(resume=False)
+        self.interrupt_last_run()
+        self.prune(resume=True)
+        self.interrupt_last_run()
+        os.remove(self.podman_log)
+
+        self.prune(resume=True)
+        self.assertEqual(['sat:2.10.0'], self.deleted_versions())
+
+    def test_resume_completed_version_changed(self):
+        """Test that a completed operation is run again if its product version changed since."""
+        self.prune(resume=False)
+        self.interrupt_last_run()
+        os.remove(self.podman_log)
+        self.write_cluster(PRUNE_CATALOG_DATA)
+
+        self.prune(resume=True)
+        self.assertEqual(4, len(self.deleted_versions()))
+
+
+class TestResumeDelete(FakeClusterTestCase):
+    """Test resuming single deletes."""
+
+    def setUp(self):
+        """Create a fake cluster with two versions of a product."""
+        super().setUp()
+        self.journal_file = os.path.join(self.tmp_dir.name, 'journal.jsonl')
+        self.write_cluster()
+        # The product catalog must be read from the cluster given to the deletion utility.
+        patch.dict(os.environ).start()
+        os.environ.pop('KUBECONFIG', None)
+
+    def write_cluster(self):
+        """Write the kubeconfig of the fake cluster."""
+        self.kube_config = self.write_kube_config('delete.conf', [{
+            'name': 'alpha', 'resource-version': 1, 'catalog': {
+                'sat': safe_dump({'1.0.0': SAT_VERSIONS['1.0.0'], '2.0.0': SAT_VERSIONS['1.0.0']})
+            }
+        }])
+
+    def delete(self, version, resume):
+        """Run delete sat VERSION, recording it in the journal as main does."""
+        args, remaining_args = create_parser().parse_known_args(
+            ['delete', 'sat', version, '--kube-config-src-file', self.kube_config]
+        )
+        command = f'delete sat {version}'
+        journal = Journal(self.journal_file, command,
+                          find_resumable(self.journal_file, command) if resume else None)
+        journal.start_run()
+        run_product_action(args, remaining_args, journal)
+        journal.end_run('succeeded')
+
+    def test_resume_sequence_of_deletes(self):
+        """Test that each delete of a sequence which succeeded is not run again when it is resumed."""
+        self.delete('1.0.0', resume=False)
+        self.delete('2.0.0', resume=False)
+        with open(self.kube_config) as f:
+            self.assertEqual(3, json.load(f)['contexts'][0]['resource-version'])
+
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            self.delete('1.0.0', resume=True)
+            self.delete('2.0.0', resume=True)
+
+        self.assertEqual(2, len(self.podman_runs()))
+        self.assertIn('Skipping delete sat:1.0.0, completed by run', '\n'.join(logs.output))
+        self.assertIn('Skipping delete sat:2.0.0, completed by run', '\n'.join(logs.output))
+
+    def test_resume_reinstalled_version(self):
+        """Test that a delete which succeeded is run again if the version was installed again since."""
+        self.delete('1.0.0', resume=False)
+        self.write_cluster()
+        self.delete('1.0.0', resume=True)
+        self.assertEqual(2, len(self.podman_runs()))
+
+    def test_repeat_without_resume(self):
+        """Test that a delete which succeeded is run again without --resume."""
+        self.delete('1.0.0', resume=False)
+        self.delete('1.0.0', resume=False)
+        self.assertEqual(2, len(self.podman_runs()))
+
+
+if __name__ == '__main__':
+    unittest.main()
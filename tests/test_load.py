@@ -0,0 +1,213 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Load tests which run many prodmgr processes at once against the fake kubectl and podman.
+
+The number of processes is taken from $PRODMGR_LOAD_PROCESSES, which
+defaults to a number small enough for a build machine with a single CPU.
+"""
+
+from collections import namedtuple
+import json
+import os
+import re
+from subprocess import Popen, STDOUT
+import sys
+import time
+
+from tests.mocks import FakeClusterTestCase, REPO_DIR
+
+from prodmgr.history import query_runs
+from prodmgr.metrics import read_textfile
+
+LOAD_PROCESSES = int(os.environ.get('PRODMGR_LOAD_PROCESSES', 8))
+# The number of seconds each fake container runs for.
+CONTAINER_SECONDS = 2
+# The number of lines of output from each fake container.
+CONTAINER_OUTPUT_LINES = 2000
+# The peak resident set size allowed for each prodmgr process, in kilobytes.
+MEMORY_CEILING_KB = 64 * 1024
+
+ProdmgrProcess = namedtuple('ProdmgrProcess', ['returncode', 'max_rss_kb', 'output'])
+
+
+class LoadTestCase(FakeClusterTestCase):
+    """Base class for tests which run many prodmgr processes at once."""
+
+    def setUp(self):
+        """Create a log directory and a cluster with a generated product catalog."""
+        super().setUp()
+        self.log_dir = os.path.join(self.tmp_dir.name, 'logs')
+        self.metrics_file = os.path.join(self.tmp_dir.name, 'prodmgr.prom')
+        self.kube_config = self.write_kube_config('load.conf', [{'name': 'load'}])
+        self.env = dict(
+            os.environ,
+            PYTHONPATH=REPO_DIR,
+            PRODMGR_LOG_DIR=self.log_dir,
+            KUBECONFIG=self.kube_config,
+            FAKE_CATALOG_PRODUCTS=str(LOAD_PROCESSES),
+            FAKE_CATALOG_VERSIONS='10',
+            FAKE_CATALOG_IMAGES='3',
+            FAKE_KUBECTL_LATENCY='0.1',
+            FAKE_PODMAN_LATENCY=str(CONTAINER_SECONDS),
+            FAKE_PODMAN_OUTPUT_LINES=str(CONTAINER_OUTPUT_LINES),
+        )
+
+    def run_prodmgr(self, command_lines, **env):
+        """Run a prodmgr process for each command line at once and wait for them all.
+
+        Args:
+            command_lines (list of list): The arguments of each prodmgr process.
+            **env: Environment variables to add for the processes.
+
+        Returns:
+            tuple: A ProdmgrProcess for each command line, and the wall time
+                in seconds for all of them to finish.
+        """
+        start = time.monotonic()
+        processes = []
+        for index, command_line in enumerate(command_lines):
+            output_file = os.path.join(self.tmp_dir.name, f'output{index}')
+            with open(output_file, 'w') as output:
+                command = [sys.executable, '-m', 'prodmgr.main'] + command_line + [
+                    f'--kube-config-src-file={self.kube_config}', f'--metrics-file={self.metrics_file}'
+                ]
+                processes.append((Popen(command, stdout=output, stderr=STDOUT, env=dict(self.env, **env)),
+                                  output_file))
+
+        results = []
+        for process, output_file in processes:
+            # Reap the process with wait4 to get its peak memory usage.
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.WEXITSTATUS(status)
+            with open(output_file) as f:
+                results.append(ProdmgrProcess(process.returncode, usage.ru_maxrss, f.read()))
+        return results, time.monotonic() - start
+
+    def log_files(self, action):
+        """Get the contents of the log files of the given action, by file name."""
+        contents = {}
+        for name in sorted(os.listdir(self.log_dir)):
+            if name.startswith(f'{action}-'):
+                with open(os.path.join(self.log_dir, name)) as f:
+                    contents[name] = f.read()
+        return contents
+
+    def journal_results(self):
+        """Get the results of the runs in the journal, by command."""
+        with open(os.path.join(self.log_dir, 'journal.jsonl')) as f:
+            events = [json.loads(line) for line in f]
+        commands = {event['run']: event['command'] for event in events if event['event'] == 'run-start'}
+        return {commands[event['run']]: event['result'] for event in events if event['event'] == 'run-end'}
+
+    def operations_total(self):
+        """Get the total of the prodmgr_operations_total samples in the metrics textfile, by result."""
+        totals = {}
+        for (name, labels), value in read_textfile(self.metrics_file).items():
+            if name == 'prodmgr_operations_total':
+                result = dict(labels)['result']
+                totals[result] = totals.get(result, 0) + value
+        return totals
+
+
+class TestConcurrentDeletes(LoadTestCase):
+    """Test running many prodmgr delete processes at once."""
+
+    def delete_command_lines(self):
+        """Get command lines which each delete the latest version of a different product."""
+        return [['delete', f'product{index}', 'latest'] for index in range(LOAD_PROCESSES)]
+
+    def test_wall_time_and_memory(self):
+        """Test that concurrent deletes overlap and stay under the memory ceiling."""
+        results, wall_time = self.run_prodmgr(self.delete_command_lines())
+
+        self.assertEqual([0] * LOAD_PROCESSES, [result.returncode for result in results])
+        # Running the containers one after another would take at least this long.
+        serial_time = LOAD_PROCESSES * CONTAINER_SECONDS
+        self.assertLess(wall_time, serial_time * 0.75)
+        for result in results:
+            self.assertLess(result.max_rss_kb, MEMORY_CEILING_KB)
+            self.assertGreaterEqual(result.output.count('\n'), CONTAINER_OUTPUT_LINES)
+
+    def test_log_files(self):
+        """Test that each concurrent delete writes its own complete log file."""
+        results, _ = self.run_prodmgr(self.delete_command_lines())
+
+        log_files = self.log_files('delete')
+        self.assertEqual(LOAD_PROCESSES, len(log_files))
+        for index in range(LOAD_PROCESSES):
+            product = f'product{index}'
+            name, contents = next((name, contents) for name, contents in log_files.items()
+                                  if name.startswith(f'delete-{product}-latest-'))
+            self.assertIn(f'Resolved version latest of {product} to {index % 5}.0.9', contents)
+            self.assertIn(f'--log-file={os.path.join(self.log_dir, name)}', contents)
+            # No other process wrote to this log file.
+            self.assertEqual({product}, set(re.findall(r'\bproduct\d+\b', contents)))
+
+        runs = query_runs(os.path.join(self.log_dir, 'history.db'))
+        self.assertEqual(sorted(os.path.join(self.log_dir, name) for name in log_files),
+                         sorted(run['log_file'] for run in runs))
+        self.assertEqual({'success': LOAD_PROCESSES}, self.operations_total())
+
+    def test_failures(self):
+        """Test that failures among concurrent deletes are recorded consistently."""
+        results, _ = self.run_prodmgr(self.delete_command_lines(), FAKE_PODMAN_FAILURE_RATE='0.5')
+
+        failed = {f'product{index}' for index, result in enumerate(results) if result.returncode}
+        self.assertTrue(failed)
+        self.assertLess(len(failed), LOAD_PROCESSES)
+        self.assertEqual({1}, {result.returncode for result in results if result.returncode})
+
+        runs = query_runs(os.path.join(self.log_dir, 'history.db'))
+        self.assertEqual(LOAD_PROCESSES, len(runs))
+        self.assertEqual(failed, {run['product'] for run in runs if run['exit_status']})
+        self.assertEqual(
+            {f'delete product{index} latest': 'failed' if f'product{index}' in failed else 'succeeded'
+             for index in range(LOAD_PROCESSES)},
+            self.journal_results()
+        )
+        self.assertEqual({'success': LOAD_PROCESSES - len(failed), 'failure': len(failed)},
+                         self.operations_total())
+        for name, contents in self.log_files('delete').items():
+            self.assertEqual(name.split('-')[1] in failed, 'CRITICAL' in contents)
+
+
+class TestConcurrentPrune(LoadTestCase):
+    """Test the concurrency of prodmgr prune."""
+
+    def test_prune_workers(self):
+        """Test that prune workers delete versions concurrently in a single process."""
+        products = ['product0', 'product1']
+        command_line = ['prune', '--keep=2', '--workers=4'] + [f'--product={product}' for product in products]
+        results, wall_time = self.run_prodmgr([command_line], FAKE_PODMAN_LATENCY='1')
+
+        self.assertEqual(0, results[0].returncode)
+        deletions = [command[command.index('delete') + 1:command.index('delete') + 3]
+                     for command in self.podman_runs()]
+        self.assertEqual(16, len(deletions))
+        self.assertEqual(set(products), {product for product, _ in deletions})
+        # Deleting the versions one after another would take at least this long.
+        self.assertLess(wall_time, len(deletions) * 0.6)
+        self.assertLess(results[0].max_rss_kb, MEMORY_CEILING_KB)
+        self.assertEqual(16, len(query_runs(os.path.join(self.log_dir, 'history.db'), action='prune')))
@@ -26,21 +26,39 @@ Unit tests for prodmgr.
 """
 
 from argparse import Namespace
+from io import StringIO
+import json
+import mmap
+import os
 from subprocess import CalledProcessError
+from tempfile import TemporaryDirectory
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from yaml import safe_dump
 
-from tests.mocks import MOCK_CONFIGMAP_OUTPUT
+from tests.mocks import FakeClusterTestCase, MOCK_CONFIGMAP_OUTPUT, MOCK_PRODUCT_CATALOG_DATA, SAT_VERSIONS
 
-from prodmgr.main import get_docker_image, run_install_utility, run_deletion_utility, ProdmgrError
+from prodmgr.main import (
+    get_docker_image,
+    get_product_components,
+    main,
+    read_catalog_file,
+    run_snapshot,
+    run_install_utility,
+    run_deletion_utility,
+    ProdmgrError
+)
+from prodmgr.model import Catalog
+from prodmgr.parser import create_parser
 from prodmgr.constants import (
     DEFAULT_CERT_SRC_DIR,
     DEFAULT_CERT_TARGET_DIR,
     DEFAULT_CONTAINER_REGISTRY_HOSTNAME,
     DEFAULT_KUBE_CONFIG_SRC_FILE,
+    DEFAULT_KILL_GRACE,
     DEFAULT_KUBE_CONFIG_TARGET_FILE,
+    DEFAULT_LOG_DIR,
     DEFAULT_PRODUCT_CATALOG_NAME,
     DEFAULT_PRODUCT_CATALOG_NAMESPACE
 )
@@ -162,6 +180,16 @@ class TestGetDockerImage(unittest.TestCase):
                 DEFAULT_PRODUCT_CATALOG_NAMESPACE, True
             )
 
+    def test_get_docker_image_version_selector(self):
+        """Test getting the docker image of the version chosen by a selector."""
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            actual_image = get_docker_image(
+                'sat-install-utility', 'sat', 'latest', DEFAULT_PRODUCT_CATALOG_NAME,
+                DEFAULT_PRODUCT_CATALOG_NAMESPACE, True
+            )
+        self.assertEqual(('cray/sat-install-utility', '1.4.0'), actual_image)
+        self.assertIn('Resolved version latest of sat to 1.0.0', logs.output[0])
+
     def test_get_install_utility_custom_config_map_name_namespace(self):
         """Test getting an install utility image with a custom config map name and namespace"""
         with self.assertRaisesRegex(ProdmgrError, f'No product information found for sat:1.0.2'):
@@ -175,6 +203,138 @@ class TestGetDockerImage(unittest.TestCase):
         )
 
 
+class TestReadCatalogFile(unittest.TestCase):
+    """Test the read_catalog_file function."""
+
+    def setUp(self):
+        """Create a directory for catalog files."""
+        self.tmp_dir = TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the directory for catalog files."""
+        self.tmp_dir.cleanup()
+
+    def write_file(self, name, content):
+        """Write a file in the temporary directory."""
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_read_yaml_file(self):
+        """Test reading a ConfigMap saved as YAML."""
+        path = self.write_file('catalog.yaml', MOCK_CONFIGMAP_OUTPUT)
+        self.assertEqual(MOCK_PRODUCT_CATALOG_DATA, read_catalog_file(path))
+
+    def test_read_json_file(self):
+        """Test reading a ConfigMap saved as JSON."""
+        path = self.write_file('catalog.json', json.dumps({'data': MOCK_PRODUCT_CATALOG_DATA}))
+        self.assertEqual(MOCK_PRODUCT_CATALOG_DATA, read_catalog_file(path))
+
+    def test_read_memory_mapped_file(self):
+        """Test reading large files, of which only YAML files are memory-mapped."""
+        yaml_path = self.write_file('catalog.yaml', MOCK_CONFIGMAP_OUTPUT)
+        json_path = self.write_file('catalog.json', json.dumps({'data': MOCK_PRODUCT_CATALOG_DATA}))
+        with patch('prodmgr.main.CATALOG_FILE_MMAP_THRESHOLD', 1), \
+                patch('prodmgr.main.mmap.mmap', wraps=mmap.mmap) as mock_mmap:
+            self.assertEqual(MOCK_PRODUCT_CATALOG_DATA, read_catalog_file(yaml_path))
+            self.assertEqual(1, mock_mmap.call_count)
+            self.assertEqual(MOCK_PRODUCT_CATALOG_DATA, read_catalog_file(json_path))
+            self.assertEqual(1, mock_mmap.call_count)
+
+    def test_get_docker_image_from_file(self):
+        """Test finding a docker image in a catalog file without running kubectl."""
+        path = self.write_file('catalog.yaml', MOCK_CONFIGMAP_OUTPUT)
+        with patch('prodmgr.main.check_output') as mock_check_output:
+            actual_image = get_docker_image(
+                'sat-install-utility', 'sat', '1.0.0', DEFAULT_PRODUCT_CATALOG_NAME,
+                DEFAULT_PRODUCT_CATALOG_NAMESPACE, catalog_file=path
+            )
+        mock_check_output.assert_not_called()
+        self.assertEqual(('cray/sat-install-utility', '1.4.0'), actual_image)
+
+    def test_read_invalid_json_file(self):
+        """Test reading a file containing invalid JSON."""
+        path = self.write_file('catalog.json', '{"data": ')
+        with self.assertRaisesRegex(ProdmgrError, 'Failed to load data from ConfigMap file'):
+            read_catalog_file(path)
+
+    def test_read_missing_file(self):
+        """Test reading a file that does not exist."""
+        with self.assertRaisesRegex(ProdmgrError, 'Unable to to read ConfigMap file /does/not/exist'):
+            read_catalog_file('/does/not/exist')
+
+    def test_read_file_without_data(self):
+        """Test reading a file that does not contain a ConfigMap."""
+        path = self.write_file('catalog.yaml', 'kind: Pod\n')
+        with self.assertRaisesRegex(ProdmgrError, 'has no data under "data" key'):
+            read_catalog_file(path)
+
+
+class TestGetProductComponents(unittest.TestCase):
+    """Test the get_product_components function."""
+
+    def test_get_product_components(self):
+        """Test listing the components of a product version."""
+        installed_products = {'sat': SAT_VERSIONS}
+        self.assertEqual(
+            [('docker', 'cray/cray-sat:1.0.0'), ('docker', 'cray/sat-install-utility:1.4.0')],
+            get_product_components(Catalog.from_catalog_data(installed_products), 'sat', '1.0.0')
+        )
+
+    def test_get_product_components_unknown_version(self):
+        """Test listing the components of a product version that is not installed."""
+        with self.assertRaisesRegex(ProdmgrError, 'No product information found for sat:2.0.0'):
+            get_product_components(Catalog.from_catalog_data({'sat': SAT_VERSIONS}), 'sat', '2.0.0')
+
+
+class TestRunSnapshot(unittest.TestCase):
+    """Test the run_snapshot function."""
+
+    def setUp(self):
+        """Set up mocks and a directory for the snapshot."""
+        self.mock_check_output = patch('prodmgr.main.check_output').start()
+        self.mock_check_output.return_value = MOCK_CONFIGMAP_OUTPUT.encode()
+        self.tmp_dir = TemporaryDirectory()
+        self.args = Namespace(
+            file=os.path.join(self.tmp_dir.name, 'catalog.json'),
+            format='json',
+            product_catalog_name=DEFAULT_PRODUCT_CATALOG_NAME,
+            product_catalog_namespace=DEFAULT_PRODUCT_CATALOG_NAMESPACE
+        )
+
+    def tearDown(self):
+        """Stop patches and remove the snapshot directory."""
+        patch.stopall()
+        self.tmp_dir.cleanup()
+
+    def test_snapshot(self):
+        """Test saving the product catalog and reading it back."""
+        with open(self.args.file, 'w') as f:
+            f.write('old snapshot')
+        run_snapshot(self.args)
+        self.mock_check_output.assert_called_once_with(
+            ['kubectl', 'get', 'configmap', f'--namespace={DEFAULT_PRODUCT_CATALOG_NAMESPACE}',
+             DEFAULT_PRODUCT_CATALOG_NAME, '--output=json']
+        )
+        self.assertEqual(MOCK_PRODUCT_CATALOG_DATA, read_catalog_file(self.args.file))
+        self.assertEqual(['catalog.json'], os.listdir(self.tmp_dir.name))
+        self.assertEqual(0o644, os.stat(self.args.file).st_mode & 0o777)
+
+    def test_snapshot_write_failure(self):
+        """Test that the temporary file is removed if the snapshot cannot be written."""
+        with patch('prodmgr.main.os.replace', side_effect=OSError('No space left on device')):
+            with self.assertRaisesRegex(ProdmgrError, 'Unable to write product catalog snapshot'):
+                run_snapshot(self.args)
+        self.assertEqual([], os.listdir(self.tmp_dir.name))
+
+    def test_snapshot_unwritable(self):
+        """Test saving the product catalog to a directory that does not exist."""
+        self.args.file = os.path.join(self.tmp_dir.name, 'missing', 'catalog.json')
+        with self.assertRaisesRegex(ProdmgrError, 'Unable to write product catalog snapshot'):
+            run_snapshot(self.args)
+
+
 class TestRunUtility(unittest.TestCase):
     """Test the run_install_utility function and run_delete_utility function."""
 
@@ -192,10 +352,19 @@ class TestRunUtility(unittest.TestCase):
             cert_target_dir=DEFAULT_CERT_TARGET_DIR,
             product_catalog_name=DEFAULT_PRODUCT_CATALOG_NAME,
             product_catalog_namespace=DEFAULT_PRODUCT_CATALOG_NAMESPACE,
-            container_registry_hostname=DEFAULT_CONTAINER_REGISTRY_HOSTNAME
+            container_registry_hostname=DEFAULT_CONTAINER_REGISTRY_HOSTNAME,
+            extra_podman_config=None,
+            dry_run=False,
+            timeout=None,
+            kill_grace=DEFAULT_KILL_GRACE
         )
         self.remaining_args = ['--additional-option']
-        self.mock_check_call = patch('prodmgr.main.check_call').start()
+        self.mock_popen = patch('prodmgr.main.Popen').start()
+        self.mock_process = self.mock_popen.return_value
+        self.mock_process.stdout = iter(['Container output\n'])
+        self.mock_process.returncode = 0
+        patch('prodmgr.main.uuid4', return_value=Mock(hex='0123abcd')).start()
+        patch('prodmgr.main.logfile', 'delete-old-product-1.0.0').start()
 
     def tearDown(self):
         """Stop patches."""
@@ -207,7 +376,7 @@ class TestRunUtility(unittest.TestCase):
         self.image_version = '1.0.1'
         self.args.action = 'activate'
         expected_command = [
-            'podman', 'run', '--rm',
+            'podman', 'run', '--name', 'prodmgr-0123abcd', '--rm',
             '--mount', f'type=bind,src={DEFAULT_KUBE_CONFIG_SRC_FILE},target={DEFAULT_KUBE_CONFIG_TARGET_FILE},ro=true',
             '--mount', f'type=bind,src={DEFAULT_CERT_SRC_DIR},target={DEFAULT_CERT_TARGET_DIR},ro=true',
             f'{DEFAULT_CONTAINER_REGISTRY_HOSTNAME}/{self.image_name}:{self.image_version}',
@@ -216,8 +385,11 @@ class TestRunUtility(unittest.TestCase):
             f'--product-catalog-namespace={DEFAULT_PRODUCT_CATALOG_NAMESPACE}',
             '--additional-option'
         ]
-        run_install_utility(self.image_name, self.image_version, self.args, self.remaining_args)
-        self.mock_check_call.assert_called_once_with(expected_command)
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            run_install_utility(self.image_name, self.image_version, self.args, self.remaining_args)
+        self.assertEqual(expected_command, self.mock_popen.call_args[0][0])
+        self.mock_process.wait.assert_called_once_with(timeout=None)
+        self.assertIn('Container output', logs.output[-1])
 
     def test_run_delete_utility_default(self):
         """Test running run_deletion_utility with default arguments."""
@@ -227,17 +399,159 @@ class TestRunUtility(unittest.TestCase):
         self.args.action = 'delete'
 
         expected_command = [
-            'podman', 'run', '--rm',
+            'podman', 'run', '--name', 'prodmgr-0123abcd', '--rm',
             '--mount', f'type=bind,src={DEFAULT_KUBE_CONFIG_SRC_FILE},target={DEFAULT_KUBE_CONFIG_TARGET_FILE},ro=true',
             '--mount', f'type=bind,src={DEFAULT_CERT_SRC_DIR},target={DEFAULT_CERT_TARGET_DIR},ro=true',
+            '--mount', f'type=bind,src={DEFAULT_LOG_DIR},target={DEFAULT_LOG_DIR},ro=false',
             f'{DEFAULT_CONTAINER_REGISTRY_HOSTNAME}/{self.image_name}:{self.image_version}',
             self.args.action, self.args.product, self.image_version,
             f'--product-catalog-name={DEFAULT_PRODUCT_CATALOG_NAME}',
             f'--product-catalog-namespace={DEFAULT_PRODUCT_CATALOG_NAMESPACE}',
+            '--log-file=delete-old-product-1.0.0',
+            '--dry-run=False',
             '--additional-option'
         ]
-        run_deletion_utility(self.image_name, self.image_version, self.args, self.remaining_args)
-        self.mock_check_call.assert_called_once_with(expected_command)
+        self.assertEqual('Container output\n', run_deletion_utility(
+            self.image_name, self.image_version, self.args, self.remaining_args, capture_output=True
+        ))
+        self.assertEqual(expected_command, self.mock_popen.call_args[0][0])
+
+    def test_run_utility_extra_podman_name(self):
+        """Test that a container name given in --extra-podman-config is used."""
+        self.args.extra_podman_config = '--no-hosts --name deletion-container'
+        self.args.dry_run = True
+        run_deletion_utility(self.image_name, self.image_version, self.args, self.remaining_args,
+                             capture_output=True)
+        command = self.mock_popen.call_args[0][0]
+        self.assertEqual(['deletion-container'], [command[index + 1] for index, arg in enumerate(command)
+                                                  if arg == '--name'])
+
+    def test_run_utility_failure(self):
+        """Test that a container exiting with a non-zero status raises ProdmgrError."""
+        self.mock_process.returncode = 2
+        with self.assertLogs('prodmgr', level='ERROR'):
+            with self.assertRaisesRegex(ProdmgrError, 'Running No-Image failed: .*exit status 2'):
+                run_install_utility(self.image_name, self.image_version, self.args, self.remaining_args)
+
+
+class TestRunUtilityTimeout(FakeClusterTestCase):
+    """Test stopping utility containers which run for longer than --timeout."""
+
+    def setUp(self):
+        """Create a fake cluster whose containers do not exit."""
+        super().setUp()
+        self.args = Namespace(
+            product='sat', action='delete', version='1.0.0',
+            kube_config_src_file=self.write_kube_config('slow.conf', [
+                {'name': 'slow', 'podman-sleep': 60, 'ignore-sigterm': True}
+            ]),
+            kube_config_target_file=DEFAULT_KUBE_CONFIG_TARGET_FILE,
+            cert_src_dir=DEFAULT_CERT_SRC_DIR,
+            cert_target_dir=DEFAULT_CERT_TARGET_DIR,
+            product_catalog_name=DEFAULT_PRODUCT_CATALOG_NAME,
+            product_catalog_namespace=DEFAULT_PRODUCT_CATALOG_NAMESPACE,
+            container_registry_hostname=DEFAULT_CONTAINER_REGISTRY_HOSTNAME,
+            extra_podman_config=None,
+            dry_run=False,
+            timeout=1,
+            kill_grace=1
+        )
+
+    def test_timeout(self):
+        """Test that a container is stopped, killed and removed when it times out."""
+        with self.assertLogs('prodmgr', level='WARNING') as logs:
+            with self.assertRaisesRegex(ProdmgrError, 'Running product-deletion-utility timed out after 1 seconds'):
+                run_deletion_utility('product-deletion-utility', '1.0.0', self.args, [], capture_output=True)
+
+        run, stop, remove = self.podman_commands()
+        name = run[run.index('--name') + 1]
+        self.assertEqual(['stop', '--time', '1', name], stop)
+        self.assertEqual(['rm', '--force', '--ignore', name], remove)
+        self.assertRegex(logs.output[-1],
+                         r'before it was stopped:\nRan registry.local/product-deletion-utility:1.0.0 delete')
+
+    def test_no_timeout(self):
+        """Test that a container which exits in time is not stopped."""
+        self.write_kube_config('slow.conf', [{'name': 'slow', 'podman-sleep': 0.1}])
+        self.assertIn('Ran ', run_deletion_utility('product-deletion-utility', '1.0.0', self.args, [],
+                                                   capture_output=True))
+        self.assertEqual(['run'], [command[0] for command in self.podman_commands()])
+
+    def test_invalid_utf8_output(self):
+        """Test that output which is not valid UTF-8 is read without blocking the container."""
+        self.write_kube_config('slow.conf', [{'name': 'slow', 'podman-sleep': 0.1, 'podman-invalid-utf8': True}])
+        output = run_deletion_utility('product-deletion-utility', '1.0.0', self.args, [], capture_output=True)
+        self.assertIn('Invalid \ufffd\ufffd output', output)
+        self.assertEqual(['run'], [command[0] for command in self.podman_commands()])
+
+
+class TestMainOptions(unittest.TestCase):
+    """Test the options which are rejected by main before anything is run."""
+
+    def assert_rejected(self, argv, message):
+        """Assert that main exits with a usage error for a command line."""
+        with patch('sys.argv', ['prodmgr'] + argv), patch('sys.stderr', new_callable=StringIO) as stderr, \
+                patch('prodmgr.main._setup_logging') as setup_logging:
+            with self.assertRaises(SystemExit) as raised:
+                main()
+        self.assertEqual(2, raised.exception.code)
+        self.assertIn(message, stderr.getvalue())
+        setup_logging.assert_not_called()
+
+    def test_resume_dry_run(self):
+        """Test that --resume is rejected with --dry-run."""
+        self.assert_rejected(['delete', 'sat', '1.0.0', '--resume', '--dry-run'],
+                             '--resume cannot be used with --dry-run')
+
+    def test_timeout(self):
+        """Test that --timeout must be positive."""
+        self.assert_rejected(['delete', 'sat', '1.0.0', '--timeout', '-1'], '--timeout must be at least 1')
+
+    def test_kill_grace(self):
+        """Test that --kill-grace must not be negative."""
+        self.assert_rejected(['prune', '--keep', '1', '--kill-grace', '-5'], '--kill-grace must not be negative')
+
+    def test_delete_catalog_file(self):
+        """Test that delete only reads a catalog file with --dry-run."""
+        self.assert_rejected(['delete', 'sat', '1.0.0', '--catalog-file', 'catalog.json'],
+                             '--catalog-file can only be used with delete --dry-run')
+
+    def test_prune_catalog_file(self):
+        """Test that prune only reads a catalog file with --dry-run."""
+        self.assert_rejected(['prune', '--keep', '1', '--catalog-file', 'catalog.json'],
+                             '--catalog-file can only be used with prune --dry-run')
+
+    def test_options_before_action(self):
+        """Test that options given before the action are checked too."""
+        self.assert_rejected(['--catalog-file', 'catalog.json', 'prune', '--keep', '1'],
+                             '--catalog-file can only be used with prune --dry-run')
+
+
+class TestCreateParser(unittest.TestCase):
+    """Test parsing command lines."""
+
+    def test_options_before_action(self):
+        """Test that options before the action are parsed as if they followed it."""
+        args, remaining_args = create_parser().parse_known_args(
+            ['--dry-run', '--kube-config-src-file', 'admin.conf', 'delete', 'sat', '1.0.0']
+        )
+        self.assertEqual(('delete', 'sat', '1.0.0'), (args.action, args.product, args.version))
+        self.assertTrue(args.dry_run)
+        self.assertEqual('admin.conf', args.kube_config_src_file)
+        self.assertEqual([], remaining_args)
+
+    def test_prune_options_before_action(self):
+        """Test that prune options before the action are parsed."""
+        args, remaining_args = create_parser().parse_known_args(['--dry-run', 'prune', '--keep', '1'])
+        self.assertEqual('prune', args.action)
+        self.assertTrue(args.dry_run)
+        self.assertEqual([], remaining_args)
+
+    def test_container_options(self):
+        """Test that options unknown to prodmgr are passed to the container wherever they are given."""
+        _, remaining_args = create_parser().parse_known_args(['--force', 'delete', 'sat', '1.0.0', '--quiet'])
+        self.assertEqual(['--force', '--quiet'], remaining_args)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,144 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for prodmgr.metrics.
+"""
+
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from prodmgr.metrics import Metrics, read_textfile
+
+
+def sample_key(name, **labels):
+    """Get the key of a sample with the delete and sat labels and the given extra labels."""
+    return name, tuple(sorted(dict(labels, action='delete', product='sat').items()))
+
+
+class TestMetrics(unittest.TestCase):
+    """Test the Metrics class."""
+
+    def setUp(self):
+        """Create a metrics registry and a directory for the textfile."""
+        self.metrics = Metrics()
+        self.metrics.set_labels(action='delete', product='sat')
+        self.tmp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'prodmgr.prom')
+
+    def tearDown(self):
+        """Remove the textfile directory."""
+        self.tmp_dir.cleanup()
+
+    def test_inc(self):
+        """Test incrementing a counter with the default and extra labels."""
+        self.metrics.inc('prodmgr_operations_total', result='success')
+        self.metrics.inc('prodmgr_operations_total', result='success')
+        self.assertEqual({sample_key('prodmgr_operations_total', result='success'): 2}, self.metrics.samples)
+
+    def test_observe(self):
+        """Test that an observation is counted in every bucket at least as large."""
+        self.metrics.observe('prodmgr_container_run_seconds', 7)
+        samples = self.metrics.samples
+        self.assertEqual(0, samples[sample_key('prodmgr_container_run_seconds_bucket', le='5')])
+        self.assertEqual(1, samples[sample_key('prodmgr_container_run_seconds_bucket', le='10')])
+        self.assertEqual(1, samples[sample_key('prodmgr_container_run_seconds_bucket', le='+Inf')])
+        self.assertEqual(7, samples[sample_key('prodmgr_container_run_seconds_sum')])
+        self.assertEqual(1, samples[sample_key('prodmgr_container_run_seconds_count')])
+
+    def test_write_textfile(self):
+        """Test writing a new textfile."""
+        self.metrics.inc('prodmgr_operations_total', result='success')
+        self.metrics.observe('prodmgr_catalog_fetch_seconds', 0.25)
+        self.metrics.write_textfile(self.path)
+
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertIn('# TYPE prodmgr_catalog_fetch_seconds histogram', lines)
+        self.assertIn('prodmgr_catalog_fetch_seconds_bucket{action="delete",product="sat",le="0.1"} 0', lines)
+        self.assertIn('prodmgr_catalog_fetch_seconds_bucket{action="delete",product="sat",le="0.5"} 1', lines)
+        self.assertEqual('prodmgr_catalog_fetch_seconds_bucket{action="delete",product="sat",le="+Inf"} 1',
+                         lines[lines.index('prodmgr_catalog_fetch_seconds_count{action="delete",product="sat"} 1') - 1])
+        self.assertIn('prodmgr_operations_total{action="delete",product="sat",result="success"} 1', lines)
+        self.assertEqual({'prodmgr.prom', 'prodmgr.prom.lock'}, set(os.listdir(self.tmp_dir.name)))
+
+    def test_write_textfile_accumulates(self):
+        """Test that the samples of successive runs are added together."""
+        self.metrics.inc('prodmgr_operations_total', result='success')
+        self.metrics.observe('prodmgr_container_run_seconds', 1.5)
+        self.metrics.write_textfile(self.path)
+
+        second_run = Metrics()
+        second_run.set_labels(action='delete', product='sat')
+        second_run.inc('prodmgr_operations_total', result='success')
+        second_run.inc('prodmgr_operations_total', result='failure')
+        second_run.observe('prodmgr_container_run_seconds', 2)
+        second_run.write_textfile(self.path)
+
+        samples = read_textfile(self.path)
+        self.assertEqual(2, samples[sample_key('prodmgr_operations_total', result='success')])
+        self.assertEqual(1, samples[sample_key('prodmgr_operations_total', result='failure')])
+        self.assertEqual(3.5, samples[sample_key('prodmgr_container_run_seconds_sum')])
+        self.assertEqual(2, samples[sample_key('prodmgr_container_run_seconds_count')])
+
+    def test_label_escaping(self):
+        """Test that label values are escaped and read back unchanged."""
+        self.metrics.set_labels(action='delete', product='odd "name"\\with\nnewline')
+        self.metrics.inc('prodmgr_operations_total')
+        self.metrics.write_textfile(self.path)
+        self.assertEqual(self.metrics.samples, read_textfile(self.path))
+
+    def test_damaged_textfile(self):
+        """Test that unparseable lines in an existing textfile are dropped."""
+        with open(self.path, 'w') as f:
+            f.write('not a sample\nprodmgr_operations_total{action="delete"} many\n')
+        self.metrics.inc('prodmgr_operations_total')
+        self.metrics.write_textfile(self.path)
+        self.assertEqual(self.metrics.samples, read_textfile(self.path))
+
+    def test_non_finite_samples(self):
+        """Test that NaN and infinite samples in an existing textfile are written back."""
+        with open(self.path, 'w') as f:
+            f.write('prodmgr_operations_total{action="delete"} NaN\n'
+                    'prodmgr_catalog_parsed_bytes_total{action="delete"} +Inf\n')
+        self.metrics.inc('prodmgr_operations_total')
+        self.metrics.write_textfile(self.path)
+
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertIn('prodmgr_operations_total{action="delete"} NaN', lines)
+        self.assertIn('prodmgr_catalog_parsed_bytes_total{action="delete"} +Inf', lines)
+
+    def test_write_failure(self):
+        """Test that the temporary file is removed if the textfile cannot be replaced."""
+        self.metrics.inc('prodmgr_operations_total')
+        with patch('prodmgr.metrics.os.replace', side_effect=OSError('No space left on device')):
+            with self.assertRaisesRegex(OSError, 'No space left on device'):
+                self.metrics.write_textfile(self.path)
+        self.assertEqual({'prodmgr.prom.lock'}, set(os.listdir(self.tmp_dir.name)))
+
+
+if __name__ == '__main__':
+    unittest.main()
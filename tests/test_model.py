@@ -0,0 +1,126 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for prodmgr.model.
+"""
+
+import unittest
+
+from tests.mocks import SAT_VERSIONS
+
+from prodmgr.errors import ProdmgrError
+from prodmgr.model import Catalog, ComponentEntry
+
+
+class TestComponentEntry(unittest.TestCase):
+    """Test the ComponentEntry class."""
+
+    def test_name_with_prefix(self):
+        """Test that a name with a path prefix is split and rebuilt."""
+        entry = ComponentEntry('docker', 'cray/cray-sat', '1.0.0')
+        self.assertEqual(('cray', 'cray-sat', 'cray/cray-sat'), (entry.prefix, entry.basename, entry.name))
+
+    def test_name_without_prefix(self):
+        """Test a plain name such as a manifest path without a directory."""
+        entry = ComponentEntry.from_catalog_entry('manifests', 'manifest.yaml')
+        self.assertEqual(('manifest.yaml', None), (entry.name, entry.version))
+
+    def test_strings_interned(self):
+        """Test that repeated strings are shared between entries."""
+        first = ComponentEntry('docker', ''.join(['cray/', 'cray-sat']), 1.0)
+        second = ComponentEntry(''.join(['dock', 'er']), 'cray/cray-sat', '1.0')
+        self.assertIs(first.kind, second.kind)
+        self.assertIs(first.prefix, second.prefix)
+        self.assertIs(first.basename, second.basename)
+        self.assertIs(first.version, second.version)
+
+    def test_slotted(self):
+        """Test that entries have no per-instance dict."""
+        self.assertFalse(hasattr(ComponentEntry('docker', 'cray/cray-sat'), '__dict__'))
+
+
+class TestCatalog(unittest.TestCase):
+    """Test the Catalog class."""
+
+    def setUp(self):
+        """Create a catalog."""
+        self.catalog = Catalog.from_catalog_data({
+            'sat': SAT_VERSIONS,
+            'cos': {'2.5.101': {'configuration': {}}, '2.5.102': None}
+        })
+
+    def test_get(self):
+        """Test getting product versions."""
+        self.assertEqual(2, len(self.catalog.get('sat', '1.0.0').components))
+        self.assertIsNone(self.catalog.get('sat', '2.0.0'))
+        self.assertIsNone(self.catalog.get('uan', '1.0.0'))
+        self.assertEqual(['2.5.101', '2.5.102'], self.catalog.versions('cos'))
+
+    def test_malformed_entries(self):
+        """Test that malformed products and versions are left out of or empty in the catalog."""
+        catalog = Catalog.from_catalog_data({
+            'junk': 'not a dict of versions',
+            'sat': SAT_VERSIONS,
+            'cos': {'1.0.0': 'junk', '2.0.0': {'component_versions': 'junk'},
+                    '3.0.0': {'component_versions': {'docker': 'junk'}}},
+        })
+        self.assertEqual([], catalog.versions('junk'))
+        self.assertEqual('1.4.0', catalog.find_docker_image('sat-install-utility', 'sat', '1.0.0').version)
+        self.assertEqual(['1.0.0', '2.0.0', '3.0.0'], catalog.versions('cos'))
+        for version in catalog.versions('cos'):
+            self.assertEqual((), catalog.get('cos', version).components)
+
+    def test_active(self):
+        """Test that versions marked active in the catalog are active."""
+        catalog = Catalog.from_catalog_data({'cos': {'2.5.101': {'active': True}, '2.5.102': {}}})
+        self.assertTrue(catalog.get('cos', '2.5.101').active)
+        self.assertFalse(catalog.get('cos', '2.5.102').active)
+        self.assertFalse(self.catalog.get('cos', '2.5.102').active)
+
+    def test_find_docker_image_base_name(self):
+        """Test finding a docker image by its base name."""
+        image = self.catalog.find_docker_image('sat-install-utility', 'sat', '1.0.0')
+        self.assertEqual(('cray/sat-install-utility', '1.4.0'), (image.name, image.version))
+
+    def test_find_docker_image_full_name(self):
+        """Test finding a docker image by its full name."""
+        image = self.catalog.find_docker_image('cray/cray-sat', 'sat', '1.0.0', base_name_match=False)
+        self.assertEqual('1.0.0', image.version)
+
+    def test_find_docker_image_no_components(self):
+        """Test finding a docker image in a product version without components."""
+        with self.assertRaisesRegex(ProdmgrError, 'No component information found for cos:2.5.101'):
+            self.catalog.find_docker_image('cos-install-utility', 'cos', '2.5.101')
+
+    def test_find_docker_image_multiple(self):
+        """Test finding a docker image which appears more than once."""
+        catalog = Catalog.from_catalog_data({'sat': {'1.0.0': {'component_versions': {'docker': [
+            {'name': 'cray/sat', 'version': '1'}, {'name': 'other/sat', 'version': '2'}
+        ]}}}})
+        with self.assertRaisesRegex(ProdmgrError, 'Multiple sat images found'):
+            catalog.find_docker_image('sat', 'sat', '1.0.0')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,227 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for pruning old product versions.
+"""
+
+from glob import glob
+import os
+import signal
+import sqlite3
+from subprocess import PIPE, Popen, STDOUT
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+from yaml import safe_dump
+
+from tests.mocks import FakeClusterTestCase, PRUNE_CATALOG_DATA, REPO_DIR
+
+from prodmgr.errors import ProdmgrError
+from prodmgr.main import run_prune
+from prodmgr.metrics import Metrics
+from prodmgr.model import Catalog
+from prodmgr.parser import create_parser
+from prodmgr.prune import parse_keep_overrides, plan_prune
+
+
+class TestParseKeepOverrides(unittest.TestCase):
+    """Test the parse_keep_overrides function."""
+
+    def test_parse_overrides(self):
+        """Test parsing per-product retention counts."""
+        self.assertEqual({'sat': 1, 'cos': 0}, parse_keep_overrides(['sat=1', 'cos=0']))
+
+    def test_parse_no_overrides(self):
+        """Test parsing when no overrides are given."""
+        self.assertEqual({}, parse_keep_overrides(None))
+
+    def test_parse_invalid_override(self):
+        """Test parsing overrides which are not of the form PRODUCT=N."""
+        for override in ('sat', 'sat=', '=2', 'sat=-1', 'sat=two'):
+            with self.assertRaisesRegex(ProdmgrError, 'expected PRODUCT=N'):
+                parse_keep_overrides([override])
+
+
+class TestPlanPrune(unittest.TestCase):
+    """Test the plan_prune function."""
+
+    def setUp(self):
+        """Create a catalog with several versions of each product."""
+        self.catalog = Catalog.from_catalog_data(PRUNE_CATALOG_DATA)
+
+    def test_plan_keep_newest(self):
+        """Test that all but the newest versions are deleted, oldest first."""
+        self.assertEqual(
+            ['sat:2.9.0', 'sat:2.10.0'],
+            [candidate.name for candidate in plan_prune(self.catalog, 2)]
+        )
+
+    def test_plan_skips_active(self):
+        """Test that active versions are not deleted even when older than those kept."""
+        self.assertEqual(
+            ['cos:2.5.0'],
+            [candidate.name for candidate in plan_prune(self.catalog, 1, products=['cos'])]
+        )
+
+    def test_plan_keep_override(self):
+        """Test that a per-product count overrides the default count."""
+        self.assertEqual(
+            ['cos:2.5.0', 'cos:2.6.0', 'sat:2.9.0', 'sat:2.10.0', 'sat:2.10.1-rc.1'],
+            [candidate.name for candidate in plan_prune(self.catalog, 1, {'cos': 0, 'slingshot': 0},
+                                                        products=['sat', 'cos'])]
+        )
+
+    def test_plan_nothing_to_prune(self):
+        """Test planning when every product has no more than the versions to keep."""
+        self.assertEqual([], plan_prune(self.catalog, 4))
+        self.assertEqual([], plan_prune(self.catalog, 1, products=['not-installed']))
+
+
+class TestRunPrune(FakeClusterTestCase):
+    """Test the run_prune function."""
+
+    def setUp(self):
+        """Point kubectl at a fake cluster with several versions of each product."""
+        super().setUp()
+        self.kube_config = self.write_kube_config('prune.conf', [{'name': 'alpha', 'catalog': {
+            product: safe_dump(versions) for product, versions in PRUNE_CATALOG_DATA.items()
+        }}])
+        patch.dict(os.environ, {'KUBECONFIG': self.kube_config}).start()
+
+    def parse_args(self, *args):
+        """Parse a prodmgr prune command line."""
+        return create_parser().parse_known_args(['prune', '--kube-config-src-file', self.kube_config] +
+                                                list(args))
+
+    def deleted_versions(self):
+        """Get the product versions deleted by podman so far."""
+        return sorted(
+            ':'.join(run[run.index('delete') + 1:run.index('delete') + 3]) for run in self.podman_runs()
+        )
+
+    def test_prune(self):
+        """Test deleting the old versions of every product."""
+        args, remaining_args = self.parse_args('--keep', '2', '--keep-product', 'cos=1', '--workers', '2')
+
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            run_prune(args, remaining_args)
+
+        self.assertEqual(['cos:2.5.0', 'sat:2.10.0', 'sat:2.9.0'], self.deleted_versions())
+        log_files = {arg for run in self.podman_runs() for arg in run if arg.startswith('--log-file=')}
+        self.assertEqual(3, len(log_files))
+        self.assertEqual(1, len([command for command in self.podman_commands() if command[0] == 'pull']))
+        self.assertTrue(all('--dry-run=False' in run for run in self.podman_runs()))
+        self.assertRegex(logs.output[-1], r'sat:2.9.0\s+deleted')
+
+        with sqlite3.connect(os.path.join(self.tmp_dir.name, 'history.db')) as connection:
+            rows = connection.execute('SELECT action, product, version, exit_status FROM runs').fetchall()
+        self.assertEqual(
+            [('prune', 'cos', '2.5.0', 0), ('prune', 'sat', '2.10.0', 0), ('prune', 'sat', '2.9.0', 0)],
+            sorted(rows)
+        )
+
+    def test_prune_metrics(self):
+        """Test that the container run time of each deletion is labelled with its product."""
+        metrics = Metrics()
+        metrics.set_labels(action='prune', product='')
+        patch('prodmgr.main.METRICS', metrics).start()
+        args, remaining_args = self.parse_args('--keep', '1', '--product', 'sat', '--product', 'cos')
+
+        with self.assertLogs('prodmgr', level='INFO'):
+            run_prune(args, remaining_args)
+
+        counts = {dict(labels)['product']: value for (name, labels), value in metrics.samples.items()
+                  if name == 'prodmgr_container_run_seconds_count'}
+        self.assertEqual({'sat': 3, 'cos': 1}, counts)
+
+    def test_prune_dry_run(self):
+        """Test that a dry run lists the versions to delete without deleting them."""
+        args, remaining_args = self.parse_args('--keep', '1', '--product', 'sat', '--dry-run')
+
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            run_prune(args, remaining_args)
+
+        self.assertEqual([], self.podman_runs())
+        self.assertIn('sat:2.10.1-rc.1', logs.output[-1])
+        self.assertNotIn('cos', logs.output[-1])
+
+    def test_prune_failure(self):
+        """Test that a failed deletion is reported after the others complete."""
+        self.write_kube_config('prune.conf', [{'name': 'alpha', 'podman-exit-code': 1, 'catalog': {
+            'cos': safe_dump(PRUNE_CATALOG_DATA['cos'])
+        }}])
+        args, remaining_args = self.parse_args('--keep', '0')
+
+        with self.assertLogs('prodmgr', level='INFO'):
+            with self.assertRaisesRegex(ProdmgrError, 'Deleting 2 of 2 product versions failed'):
+                run_prune(args, remaining_args)
+        self.assertEqual(['cos:2.5.0', 'cos:2.6.0'], self.deleted_versions())
+
+    def test_prune_invalid_workers(self):
+        """Test that the number of workers must be positive."""
+        args, remaining_args = self.parse_args('--keep', '1', '--workers', '0')
+        with self.assertRaisesRegex(ProdmgrError, '--workers must be at least 1'):
+            run_prune(args, remaining_args)
+
+
+class TestInterruptPrune(FakeClusterTestCase):
+    """Test interrupting prodmgr while prune runs several containers at once."""
+
+    def test_interrupt(self):
+        """Test that every running container is stopped and removed, and no more are started."""
+        kube_config = self.write_kube_config('prune.conf', [{'name': 'alpha', 'podman-sleep': 60, 'catalog': {
+            product: safe_dump(versions) for product, versions in PRUNE_CATALOG_DATA.items()
+        }}])
+        process = Popen(
+            [sys.executable, '-m', 'prodmgr.main', 'prune', '--keep', '1', '--workers', '2', '--kill-grace', '1',
+             '--kube-config-src-file', kube_config],
+            stdout=PIPE, stderr=STDOUT, universal_newlines=True,
+            env=dict(os.environ, KUBECONFIG=kube_config, PYTHONPATH=REPO_DIR,
+                     PRODMGR_LOG_DIR=os.path.join(self.tmp_dir.name, 'logs'))
+        )
+        self.addCleanup(process.kill)
+        deadline = time.monotonic() + 30
+        while len(glob(os.path.join(self.tmp_dir.name, 'container-*.pid'))) < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+        interrupted = time.monotonic()
+        process.send_signal(signal.SIGINT)
+        output, _ = process.communicate(timeout=30)
+
+        self.assertEqual(130, process.returncode)
+        self.assertLess(time.monotonic() - interrupted, 10)
+        self.assertIn('CRITICAL - Interrupted', output)
+        self.assertNotIn('Traceback', output)
+        # Two of the four deletions were running, and the others were not started.
+        names = {run[run.index('--name') + 1] for run in self.podman_runs()}
+        self.assertEqual(2, len(names))
+        self.assertEqual(names, {command[-1] for command in self.podman_commands() if command[0] == 'stop'})
+        self.assertEqual(names, {command[-1] for command in self.podman_commands() if command[0] == 'rm'})
+        self.assertEqual([], glob(os.path.join(self.tmp_dir.name, 'container-*.pid')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for running prodmgr against multiple targets.
+"""
+
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from yaml import safe_dump
+
+from tests.mocks import FakeClusterTestCase, MOCK_PRODUCT_CATALOG_DATA
+
+from prodmgr.errors import ProdmgrError
+from prodmgr.history import query_runs
+from prodmgr.main import run_multi_target
+from prodmgr.parser import create_parser
+from prodmgr.targets import resolve_targets, Target
+
+
+class TestResolveTargets(FakeClusterTestCase):
+    """Test the resolve_targets function."""
+
+    def test_resolve_files_and_contexts(self):
+        """Test resolving kubeconfig files and contexts to targets."""
+        alpha = self.write_kube_config('alpha.conf', [{'name': 'alpha'}])
+        multi = self.write_kube_config('multi.conf', [{'name': 'beta'}, {'name': 'gamma'}])
+        targets = resolve_targets([alpha], ['gamma'], multi, self.tmp_dir.name)
+
+        self.assertEqual(['alpha.conf', 'gamma'], [os.path.basename(target.name) for target in targets])
+        self.assertEqual(alpha, targets[0].kube_config)
+        with open(targets[1].kube_config) as f:
+            self.assertEqual('gamma', json.load(f)['current-context'])
+
+    def test_resolve_missing_file(self):
+        """Test resolving a kubeconfig file that does not exist."""
+        with self.assertRaisesRegex(ProdmgrError, 'does not exist'):
+            resolve_targets(['/does/not/exist'], [], None, self.tmp_dir.name)
+
+    def test_resolve_missing_context(self):
+        """Test resolving a context that does not exist."""
+        multi = self.write_kube_config('multi.conf', [{'name': 'beta'}])
+        with self.assertRaisesRegex(ProdmgrError, 'Unable to read context delta'):
+            resolve_targets([], ['delta'], multi, self.tmp_dir.name)
+
+    def test_resolve_duplicate_target(self):
+        """Test giving the same target twice."""
+        multi = self.write_kube_config('multi.conf', [{'name': 'beta'}])
+        with self.assertRaisesRegex(ProdmgrError, 'more than once: beta'):
+            resolve_targets([], ['beta', 'beta'], multi, self.tmp_dir.name)
+
+
+class TestRunMultiTarget(FakeClusterTestCase):
+    """Test the run_multi_target function."""
+
+    def parse_args(self, *args):
+        """Parse a prodmgr command line."""
+        return create_parser().parse_known_args(list(args))
+
+    def test_delete_on_all_targets(self):
+        """Test deleting a product from every target cluster."""
+        alpha = self.write_kube_config('alpha.conf', [{'name': 'alpha', 'catalog': MOCK_PRODUCT_CATALOG_DATA}])
+        beta = self.write_kube_config('beta.conf', [{'name': 'beta', 'catalog': MOCK_PRODUCT_CATALOG_DATA}])
+        args, remaining_args = self.parse_args('delete', 'sat', '1.0.0', '--target', alpha, '--target', beta)
+
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            run_multi_target(args, remaining_args)
+
+        runs = self.podman_runs()
+        self.assertEqual(2, len(runs))
+        self.assertEqual({alpha, beta}, {run[run.index('--mount') + 1].split(',')[1][len('src='):] for run in runs})
+        self.assertEqual(2, len({arg for run in runs for arg in run if arg.startswith('--log-file=')}))
+        pulls = [command for command in self.podman_commands() if command[0] == 'pull']
+        self.assertEqual(1, len(pulls))
+        report = logs.output[-1]
+        self.assertIn('Ran ', '\n'.join(logs.output))
+        self.assertIn(f'Pulled {pulls[0][-1]} in ', '\n'.join(logs.output))
+        self.assertRegex(report, r'alpha.conf\s+succeeded')
+        self.assertRegex(report, r'beta.conf\s+succeeded')
+
+    def test_skip_target_without_product(self):
+        """Test that targets without the product version installed are skipped."""
+        alpha = self.write_kube_config('alpha.conf', [{'name': 'alpha', 'catalog': MOCK_PRODUCT_CATALOG_DATA}])
+        beta = self.write_kube_config('beta.conf', [{'name': 'beta', 'catalog': {'cos': '{}'}}])
+        args, remaining_args = self.parse_args('delete', 'sat', '1.0.0', '--target', alpha, '--target', beta)
+
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            run_multi_target(args, remaining_args)
+
+        self.assertEqual(1, len(self.podman_runs()))
+        self.assertRegex(logs.output[-1], r'beta.conf\s+skipped\s+\S+\s+sat:1.0.0 is not installed')
+
+    def test_failure_on_one_target(self):
+        """Test that a failure on one target is reported without stopping the others."""
+        multi = self.write_kube_config('multi.conf', [
+            {'name': 'alpha', 'catalog': MOCK_PRODUCT_CATALOG_DATA},
+            {'name': 'beta', 'catalog': MOCK_PRODUCT_CATALOG_DATA, 'podman-exit-code': 1},
+            {'name': 'gamma'}
+        ])
+        args, remaining_args = self.parse_args('delete', 'sat', '1.0.0', '--kube-config-src-file', multi,
+                                               '--target-context', 'alpha', '--target-context', 'beta',
+                                               '--target-context', 'gamma')
+
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            with self.assertRaisesRegex(ProdmgrError, 'delete failed on 2 of 3 targets: beta, gamma'):
+                run_multi_target(args, remaining_args)
+
+        self.assertEqual(2, len(self.podman_runs()))
+        report = logs.output[-1]
+        self.assertRegex(report, r'alpha\s+succeeded')
+        self.assertRegex(report, r'beta\s+failed')
+        self.assertRegex(report, r'gamma\s+failed\s+\S+\s+Unable to to read ConfigMap')
+
+    def test_delete_version_selector(self):
+        """Test that a version selector is resolved against the catalog of each target."""
+        alpha = self.write_kube_config('alpha.conf', [{'name': 'alpha', 'catalog': MOCK_PRODUCT_CATALOG_DATA}])
+        beta = self.write_kube_config('beta.conf', [{'name': 'beta', 'catalog': {
+            'sat': safe_dump({'1.0.0': {}, '1.1.0': {}, '2.0.0': {}})
+        }}])
+        args, remaining_args = self.parse_args('delete', 'sat', '<2.0.0', '--target', alpha, '--target', beta)
+
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            run_multi_target(args, remaining_args)
+
+        self.assertEqual({'1.0.0', '1.1.0'}, {run[run.index('delete') + 2] for run in self.podman_runs()})
+        self.assertRegex(logs.output[-1], r'beta.conf\s+succeeded\s+\S+\s+version 1.1.0')
+        runs = query_runs(os.path.join(self.tmp_dir.name, 'history.db'))
+        self.assertEqual({('sat', '1.0.0', 0), ('sat', '1.1.0', 0)},
+                         {(run['product'], run['version'], run['exit_status']) for run in runs})
+        self.assertEqual({arg.split('=', 1)[1] for run in self.podman_runs() for arg in run
+                          if arg.startswith('--log-file=')},
+                         {run['log_file'] for run in runs})
+
+    def test_dry_run_not_recorded(self):
+        """Test that a dry run on several targets is not recorded in the history index."""
+        alpha = self.write_kube_config('alpha.conf', [{'name': 'alpha', 'catalog': MOCK_PRODUCT_CATALOG_DATA}])
+        args, remaining_args = self.parse_args('delete', 'sat', '1.0.0', '--target', alpha, '--dry-run')
+
+        with self.assertLogs('prodmgr', level='INFO'):
+            run_multi_target(args, remaining_args)
+
+        self.assertIn('--dry-run=True', self.podman_runs()[0])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir.name, 'history.db')))
+
+    def test_pull_failure(self):
+        """Test that a failure to pull the utility image before running it is only a warning."""
+        alpha = self.write_kube_config('alpha.conf', [{'name': 'alpha', 'catalog': MOCK_PRODUCT_CATALOG_DATA}])
+        args, remaining_args = self.parse_args('delete', 'sat', '1.0.0', '--target', alpha)
+        image = f'{args.container_registry_hostname}/{args.deletion_image_name}:{args.deletion_image_version}'
+        patch.dict(os.environ, {'FAKE_PODMAN_PULL_FAILURES': image}).start()
+
+        with self.assertLogs('prodmgr', level='INFO') as logs:
+            run_multi_target(args, remaining_args)
+
+        self.assertIn(f'WARNING:prodmgr:Unable to pull {image}', '\n'.join(logs.output))
+        self.assertEqual(1, len(self.podman_runs()))
+
+    def test_activate_on_all_targets(self):
+        """Test activating a product using the install utility in each target's catalog."""
+        alpha = self.write_kube_config('alpha.conf', [{'name': 'alpha', 'catalog': MOCK_PRODUCT_CATALOG_DATA}])
+        args, remaining_args = self.parse_args('activate', 'sat', '1.0.0', '--target', alpha)
+
+        with self.assertLogs('prodmgr', level='INFO'):
+            run_multi_target(args, remaining_args)
+
+        self.assertIn('registry.local/cray/sat-install-utility:1.4.0', self.podman_runs()[0])
+        self.assertIn(['pull', '--quiet', 'registry.local/cray/sat-install-utility:1.4.0'], self.podman_commands())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+"""
+Unit tests for prodmgr.versions.
+"""
+
+import unittest
+
+from prodmgr.errors import ProdmgrError
+from prodmgr.versions import is_version_selector, version_key, VersionIndex
+
+
+class TestVersionKey(unittest.TestCase):
+    """Test the version_key function."""
+
+    def test_semantic_order(self):
+        """Test that versions sort numerically, with pre-releases before releases."""
+        versions = ['2.10.0', '2.4.0', '2.4.0-rc.2', '2.4.0-rc.10', '2.3.10', '2.3.9', '1.0.0-alpha']
+        self.assertEqual(['1.0.0-alpha', '2.3.9', '2.3.10', '2.4.0-rc.2', '2.4.0-rc.10', '2.4.0', '2.10.0'],
+                         sorted(versions, key=version_key))
+
+    def test_build_metadata_ignored(self):
+        """Test that build metadata does not affect the order."""
+        self.assertEqual(version_key('2.4.0'), version_key('2.4.0+20230807'))
+
+    def test_non_numeric_parts(self):
+        """Test that versions with non-numeric parts can be compared with numeric ones."""
+        self.assertLess(version_key('2.4.0'), version_key('2.4.x'))
+
+
+class TestIsVersionSelector(unittest.TestCase):
+    """Test the is_version_selector function."""
+
+    def test_selectors(self):
+        """Test recognizing selectors and exact versions."""
+        for selector in ('latest', 'oldest', '<2.4.0', '<=2.4', '>1', '>= 2.0.0', '2.3.*'):
+            self.assertTrue(is_version_selector(selector), selector)
+        for version in ('2.4.0', '2.4.0-rc1', 'latest-build'):
+            self.assertFalse(is_version_selector(version), version)
+
+
+class TestVersionIndex(unittest.TestCase):
+    """Test the VersionIndex class."""
+
+    def setUp(self):
+        """Create an index of SAT versions in catalog order."""
+        self.index = VersionIndex({
+            'sat': ['2.3.10', '2.10.0', '2.3.2', '2.4.0', '2.4.0-rc1', '1.9.0'],
+            'cos': []
+        })
+
+    def test_sorted_versions(self):
+        """Test that versions are sorted semantically."""
+        self.assertEqual(['1.9.0', '2.3.2', '2.3.10', '2.4.0-rc1', '2.4.0', '2.10.0'],
+                         self.index.sorted_versions('sat'))
+
+    def test_resolve_selectors(self):
+        """Test resolving each kind of selector."""
+        for selector, expected in [
+            ('latest', '2.10.0'),
+            ('oldest', '1.9.0'),
+            ('<2.4.0', '2.4.0-rc1'),
+            ('<2.4.0-rc1', '2.3.10'),
+            ('<=2.4.0', '2.4.0'),
+            ('>2.3.2', '2.10.0'),
+            ('>=1.9.0', '2.10.0'),
+            ('2.3.*', '2.3.10'),
+            ('2.4.*', '2.4.0'),
+            ('1.*', '1.9.0'),
+            ('2.3.2', '2.3.2'),
+        ]:
+            self.assertEqual(expected, self.index.resolve('sat', selector), selector)
+
+    def test_resolve_no_match(self):
+        """Test selectors which match no installed version."""
+        for product, selector in [('sat', '<1.0.0'), ('sat', '>2.10.0'), ('sat', '3.*'), ('cos', 'latest'),
+                                  ('uan', 'latest')]:
+            with self.assertRaisesRegex(ProdmgrError, f'No installed version of {product} matches'):
+                self.index.resolve(product, selector)
+
+    def test_resolve_unknown_exact_version(self):
+        """Test resolving an exact version which is not installed."""
+        with self.assertRaisesRegex(ProdmgrError, 'No product information found for sat:2.5.0'):
+            self.index.resolve('sat', '2.5.0')
+
+    def test_resolve_invalid_wildcard(self):
+        """Test a wildcard selector whose prefix does not end in a number."""
+        with self.assertRaisesRegex(ProdmgrError, 'Invalid version selector'):
+            self.index.resolve('sat', '2.x.*')
+
+
+if __name__ == '__main__':
+    unittest.main()
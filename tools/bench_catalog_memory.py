@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# Compare the memory used by the product catalog data returned by
+# read_catalog with that used by the compact prodmgr.model.Catalog.
+
+import argparse
+import gc
+import inspect
+import os
+import sys
+import tracemalloc
+
+from yaml import safe_dump
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prodmgr.main import parse_catalog_data  # noqa: E402
+from prodmgr import model  # noqa: E402
+from prodmgr.model import Catalog  # noqa: E402
+
+
+def create_parser():
+    """Creates the ArgumentParser for this program.
+
+    Returns:
+        The argparse.ArgumentParser object to parse arguments for this script.
+    """
+    parser = argparse.ArgumentParser(
+        description='Report the memory footprint of the product catalog in dict and compact form'
+    )
+    parser.add_argument('--products', type=int, default=20,
+                        help='The number of products in the generated catalog')
+    parser.add_argument('--versions', type=int, default=10,
+                        help='The number of versions of each product')
+    parser.add_argument('--images', type=int, default=25,
+                        help='The number of Docker images in each product version')
+    return parser
+
+
+def generate_catalog_data(products, versions, images):
+    """Generate product catalog data shaped like a real product catalog.
+
+    Args:
+        products (int): The number of products.
+        versions (int): The number of versions of each product.
+        images (int): The number of Docker and Helm components of each version.
+
+    Returns:
+        dict: Product names to YAML strings, as returned by read_catalog_data.
+    """
+    catalog_data = {}
+    for product_index in range(products):
+        product = f'product{product_index}'
+        product_versions = {}
+        for version_index in range(versions):
+            version = f'{product_index % 5}.{version_index // 10}.{version_index}'
+            product_versions[version] = {
+                'component_versions': {
+                    'docker': [{'name': f'cray/{product}-image{image}', 'version': f'1.{image}.{version_index}'}
+                               for image in range(images)],
+                    'helm': [{'name': f'{product}-chart{image}', 'version': f'2.{image}.{version_index}'}
+                             for image in range(images // 5)],
+                    'repositories': [{'name': f'{product}-{version}-sle-15sp4', 'type': 'hosted'}],
+                    'manifests': [f'config-data/argo/loftsman/{product}/{version}/manifests/services.yaml'],
+                }
+            }
+        catalog_data[product] = safe_dump(product_versions)
+    return catalog_data
+
+
+def intern_line():
+    """Get the line number of the sys.intern call in prodmgr.model._intern."""
+    lines, start = inspect.getsourcelines(model._intern)
+    return start + next(index for index, line in enumerate(lines) if 'sys.intern(' in line)
+
+
+def measure(build):
+    """Measure the memory allocated by build() that is still in use after it returns.
+
+    Growth of the interpreter's table of interned strings is measured
+    separately. The table is resized when it fills, which depends on how many
+    strings were interned before, e.g. by imports, as well as on the catalog,
+    so it is reported on its own rather than hidden in the total.
+
+    Returns:
+        tuple: The object returned by build, the number of bytes it uses
+            excluding growth of the interned string table, and the number of
+            bytes by which that table grew.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    intern_filter = tracemalloc.Filter(True, model.__file__, lineno=intern_line())
+    intern_size = sum(stat.size for stat in snapshot.filter_traces([intern_filter]).statistics('filename'))
+    total_size = sum(stat.size for stat in snapshot.statistics('filename'))
+    return result, total_size - intern_size, intern_size
+
+
+def main():
+    args = create_parser().parse_args()
+    catalog_data = generate_catalog_data(args.products, args.versions, args.images)
+    raw_size = sum(len(value) for value in catalog_data.values())
+
+    _, dict_size, _ = measure(lambda: parse_catalog_data(catalog_data, 'generated catalog'))
+    # Build the compact form from a fresh copy of the dict form, which is
+    # freed before the measurement, so strings shared by both are counted.
+    _, compact_size, intern_size = measure(lambda: Catalog.from_catalog_data(
+        parse_catalog_data(catalog_data, 'generated catalog')
+    ))
+
+    mib = 1024 * 1024
+    print(f'Catalog: {args.products} products x {args.versions} versions x {args.images} images')
+    print(f'Raw YAML:         {raw_size / mib:8.2f} MiB')
+    print(f'read_catalog:     {dict_size / mib:8.2f} MiB')
+    print(f'Compact Catalog:  {compact_size / mib:8.2f} MiB ({compact_size / dict_size:.0%} of read_catalog)')
+    print(f'Intern table:     {intern_size / mib:8.2f} MiB (growth of the interned string table)')
+    print(f'Compact + table:  {(compact_size + intern_size) / mib:8.2f} MiB '
+          f'({(compact_size + intern_size) / dict_size:.0%} of read_catalog)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# Compare the startup time of prodmgr installed as a package with that of the
+# zipapp built by build_zipapp.py.
+#
+# The package is installed with "setup.py install" as in the RPM spec file,
+# and started with the prodmgr console script it generates, so the time
+# includes the entry point's imports. It uses the PyYAML installed for the
+# Python running this script, as the RPM uses the system PyYAML.
+#
+# A cold start is measured on a fresh copy of the installed files, as on a
+# system where prodmgr has not been run since it was installed, and a warm
+# start on the same copy again. The zipapp carries its own bytecode, so it is
+# measured from a fresh copy and from the same copy. None of this drops the
+# operating system's page cache.
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from tempfile import TemporaryDirectory
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_parser():
+    """Creates the ArgumentParser for this program.
+
+    Returns:
+        The argparse.ArgumentParser object to parse arguments for this script.
+    """
+    parser = argparse.ArgumentParser(
+        description='Report the cold and warm startup time of the prodmgr package and zipapp'
+    )
+    parser.add_argument('--zipapp', default=os.path.join(REPO_DIR, 'dist', 'prodmgr.pyz'),
+                        help='The zipapp built by build_zipapp.py. Default: dist/prodmgr.pyz')
+    parser.add_argument('--runs', type=int, default=10,
+                        help='The number of times to start prodmgr in each layout')
+    return parser
+
+
+def time_run(command, env=None):
+    """Time a run of "prodmgr --help".
+
+    Args:
+        command (list): The command which starts prodmgr.
+        env (dict): Environment variables to set for the command.
+
+    Returns:
+        float: The wall time taken in seconds.
+    """
+    start = time.perf_counter()
+    subprocess.check_call(command + ['--help'], stdout=subprocess.DEVNULL,
+                          env=dict(os.environ, **(env or {})))
+    return time.perf_counter() - start
+
+
+def install_package(root_dir, work_dir):
+    """Install prodmgr under root_dir as the RPM spec file does.
+
+    The source is copied to work_dir first, so that the build files are not
+    written to the repository.
+    """
+    source_dir = os.path.join(work_dir, 'source')
+    shutil.copytree(REPO_DIR, source_dir,
+                    ignore=shutil.ignore_patterns('.git', 'build', 'dist', 'tests', '*.egg-info',
+                                                  '__pycache__', '*.pyc'))
+    subprocess.check_call([sys.executable, 'setup.py', '--quiet', 'install', '-O1', f'--root={root_dir}',
+                           '--install-scripts=/usr/bin'],
+                          cwd=source_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def copy_installed_package(root_dir, target_dir):
+    """Copy the files installed by install_package.
+
+    Returns:
+        tuple: The command which starts the copy's console script, and the
+            environment variables it needs to import the copy.
+    """
+    shutil.copytree(root_dir, target_dir)
+    site_packages = next(dir_path for dir_path, dir_names, _ in os.walk(target_dir) if 'prodmgr' in dir_names)
+    return [os.path.join(target_dir, 'usr', 'bin', 'prodmgr')], {'PYTHONPATH': site_packages}
+
+
+def copy_zipapp(zipapp, target_dir):
+    """Copy the zipapp.
+
+    Returns:
+        list: The command which starts the copy.
+    """
+    os.makedirs(target_dir)
+    target = os.path.join(target_dir, os.path.basename(zipapp))
+    shutil.copy(zipapp, target)
+    return [sys.executable, target]
+
+
+def measure(runs, zipapp):
+    """Time each layout.
+
+    Returns:
+        list of tuple: The name of each layout and the times of its runs.
+    """
+    results = []
+    with TemporaryDirectory(prefix='prodmgr-bench-') as tmp_dir:
+        root_dir = os.path.join(tmp_dir, 'root')
+        install_package(root_dir, tmp_dir)
+        results.append(('package, cold', [
+            time_run(*copy_installed_package(root_dir, os.path.join(tmp_dir, f'cold{run}')))
+            for run in range(runs)
+        ]))
+
+        command, env = copy_installed_package(root_dir, os.path.join(tmp_dir, 'warm'))
+        time_run(command, env)
+        results.append(('package, warm', [time_run(command, env) for _ in range(runs)]))
+
+        results.append(('zipapp, cold', [
+            time_run(copy_zipapp(zipapp, os.path.join(tmp_dir, f'zipapp{run}'))) for run in range(runs)
+        ]))
+        command = copy_zipapp(zipapp, os.path.join(tmp_dir, 'zipapp'))
+        time_run(command)
+        results.append(('zipapp, warm', [time_run(command) for _ in range(runs)]))
+    return results
+
+
+def main():
+    args = create_parser().parse_args()
+    if not os.path.exists(args.zipapp):
+        sys.exit(f'{args.zipapp} does not exist; build it with "make zipapp"')
+
+    print(f'Python {sys.version.split()[0]}, {args.runs} runs of "prodmgr --help" per layout')
+    print(f'{"Layout":<16}{"Median":>10}{"Min":>10}')
+    for name, times in measure(args.runs, args.zipapp):
+        print(f'{name:<16}{statistics.median(times) * 1000:>8.1f}ms{min(times) * 1000:>8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
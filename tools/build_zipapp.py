@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+#
+# MIT License
+#
+# (C) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR
+# OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# Build prodmgr and its pinned dependencies into a single executable zipapp.
+#
+# The modules are compiled to bytecode at build time and stored next to their
+# sources, where zipimport finds them, so no module is compiled at startup.
+# Bytecode is specific to the Python version which runs this script, so it
+# must be run with the python3 of the systems the zipapp is installed on.
+
+import argparse
+import compileall
+import importlib.machinery
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+import zipapp
+from tempfile import TemporaryDirectory
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_parser():
+    """Creates the ArgumentParser for this program.
+
+    Returns:
+        The argparse.ArgumentParser object to parse arguments for this script.
+    """
+    parser = argparse.ArgumentParser(
+        description='Build prodmgr into an executable zipapp with precompiled bytecode'
+    )
+    parser.add_argument('--output', default=os.path.join(REPO_DIR, 'dist', 'prodmgr.pyz'),
+                        help='The zipapp to write. Default: dist/prodmgr.pyz')
+    parser.add_argument('--requirements', default=os.path.join(REPO_DIR, 'requirements-zipapp.txt'),
+                        help='The pinned requirements to bundle. Default: requirements-zipapp.txt')
+    parser.add_argument('--interpreter', default='/usr/bin/env python3',
+                        help='The interpreter for the shebang line. Default: "/usr/bin/env python3"')
+    parser.add_argument('--compress', action='store_true',
+                        help='Compress the modules in the zipapp. By default they are stored uncompressed, '
+                             'which is larger but avoids decompressing them at startup.')
+    return parser
+
+
+def install_requirements(requirements, staging_dir):
+    """Install the pinned requirements into the staging directory.
+
+    Args:
+        requirements (str): The requirements file.
+        staging_dir (str): The directory to install into.
+    """
+    subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--quiet', '--disable-pip-version-check',
+                           '--no-deps', '--no-compile', '--target', staging_dir, '--requirement', requirements])
+
+
+def remove_extension_modules(staging_dir):
+    """Remove compiled extension modules, which cannot be imported from a zipapp.
+
+    PyYAML falls back to its pure-Python implementation when its libyaml
+    extension is missing.
+
+    Args:
+        staging_dir (str): The directory containing the installed requirements.
+
+    Returns:
+        list of str: The paths removed, relative to staging_dir.
+    """
+    suffixes = tuple(importlib.machinery.EXTENSION_SUFFIXES) + ('.so', '.pyd')
+    removed = []
+    for dir_path, _, file_names in os.walk(staging_dir):
+        for file_name in file_names:
+            if file_name.endswith(suffixes):
+                os.remove(os.path.join(dir_path, file_name))
+                removed.append(os.path.relpath(os.path.join(dir_path, file_name), staging_dir))
+    return removed
+
+
+def compile_modules(staging_dir):
+    """Compile every module in the staging directory to bytecode.
+
+    The bytecode is written next to each source file, which is where zipimport
+    looks for it. Where supported, it is not checked against the source, which
+    cannot change inside the zipapp.
+
+    Args:
+        staging_dir (str): The directory to compile.
+
+    Raises:
+        RuntimeError: if any module failed to compile.
+    """
+    kwargs = {}
+    if hasattr(py_compile, 'PycInvalidationMode'):
+        kwargs['invalidation_mode'] = py_compile.PycInvalidationMode.UNCHECKED_HASH
+    if not compileall.compile_dir(staging_dir, quiet=1, legacy=True, **kwargs):
+        raise RuntimeError(f'Unable to compile modules in {staging_dir}')
+
+
+def build(output, requirements, interpreter, compress):
+    """Build the zipapp.
+
+    Args:
+        output (str): The zipapp to write.
+        requirements (str): The pinned requirements to bundle.
+        interpreter (str): The interpreter for the shebang line.
+        compress (bool): Whether to compress the modules in the zipapp.
+    """
+    with TemporaryDirectory(prefix='prodmgr-zipapp-') as staging_dir:
+        shutil.copytree(os.path.join(REPO_DIR, 'prodmgr'), os.path.join(staging_dir, 'prodmgr'),
+                        ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+        install_requirements(requirements, staging_dir)
+        for path in remove_extension_modules(staging_dir):
+            print(f'Removed extension module {path}')
+        compile_modules(staging_dir)
+
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        zipapp.create_archive(staging_dir, output, interpreter=interpreter,
+                              main='prodmgr.main:main', compressed=compress)
+
+    # Check that the zipapp runs with only its bundled modules.
+    subprocess.check_call([sys.executable, '-I', '-S', output, '--help'], stdout=subprocess.DEVNULL)
+    print(f'Wrote {output} ({os.path.getsize(output) / 1024:.0f} KiB) for Python {sys.version.split()[0]}')
+
+
+def main():
+    args = create_parser().parse_args()
+    build(args.output, args.requirements, args.interpreter, args.compress)
+
+
+if __name__ == '__main__':
+    main()